@@ -25,13 +25,17 @@ import argparse
 import logging
 from pathlib import Path
 from datetime import datetime
-import subprocess
 import shutil
-from typing import Dict, List, Tuple, Optional
-from collections import defaultdict
+import hashlib
+import json
+import re
+from typing import Dict, List, NamedTuple, Tuple, Optional
+from collections import defaultdict, Counter
+from itertools import chain
+from operator import itemgetter
 import time
 import multiprocessing
-from multiprocessing import Pool, Manager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
 import os
 
 # Add parent directory to path to import proven modules
@@ -41,11 +45,87 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.processors.docx_processor import (
     load_aliases_from_excel,
     categorize_and_sort_aliases,
-    precompile_patterns,
+    build_pattern_source,
+    compile_pattern_source,
     process_single_docx
 )
 from src.processors.pptx_processor import process_single_pptx
 from src.processors.excel_processor import process_single_xlsx, process_single_xls
+from src.utils.libreoffice_utils import LibreOfficeBatcher, convert_batch
+from src.utils.archive_utils import link_or_copy
+from src.utils.cpu_utils import available_cpu_count
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, NamedStyle, PatternFill
+
+# Legacy formats converted by LibreOffice before anonymization
+# (.xls is read directly with pandas, see process_file)
+LEGACY_FORMATS = {
+    '.doc': 'docx',
+    '.ppt': 'pptx'
+}
+
+# File signatures: OOXML files are ZIP packages; legacy Office files are
+# OLE2 compound file binaries
+ZIP_MAGIC = b'PK\x03\x04'
+CFB_MAGIC = b'\xD0\xCF\x11\xE0\xA1\xB1\x1A\xE1'
+
+# LibreOffice timeout budget per file, and files per soffice invocation
+LEGACY_TIMEOUT_PER_FILE = 300
+PDF_TIMEOUT_PER_FILE = 300
+LIBREOFFICE_BATCH_SIZE = 20
+
+# Background threads running PDF batches while anonymization continues
+PDF_WORKERS = 2
+
+# Threads copying non-processable files to the output tree
+COPY_WORKERS = 8
+
+# Threads hashing inputs for the re-run cache and duplicate detection ahead
+# of submission (file reads and hashlib release the GIL)
+HASH_WORKERS = 4
+
+# Parallel mode keeps at most this many queued files per worker process
+MAX_PENDING_PER_WORKER = 2
+
+# Re-run cache of processed files, stored in the output directory; bump the
+# version when the entry format changes. Keys are also salted with the
+# source of everything that produces outputs (the processors, their
+# utilities and this script), so any code change makes earlier outputs stale.
+OUTPUT_CACHE_FILENAME = '.anonymizer_cache.json'
+OUTPUT_CACHE_VERSION = 2
+OUTPUT_CACHE_SOURCES = ('src/processors/*.py', 'src/utils/*.py', 'batch/batch_anonymize.py')
+
+# Extensions anonymized in place (legacy ones after conversion)
+PROCESSABLE_EXTENSIONS = frozenset({'.docx', '.xlsx', '.xlsm', '.pptx', '.doc', '.xls', '.ppt'})
+
+# Extensions copied to the output as-is
+COPY_EXTENSIONS = frozenset({'.pdf', '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.txt',
+                             '.csv', '.json', '.xml', '.html', '.htm', '.zip', '.tar', '.gz'})
+
+# Extensions counted in the per-folder prompt summary
+FOLDER_INFO_EXTENSIONS = PROCESSABLE_EXTENSIONS | {'.pdf', '.png', '.jpg', '.jpeg'}
+
+# Everything the run needs from the input tree (discovery, prompts, copying)
+SCAN_EXTENSIONS = PROCESSABLE_EXTENSIONS | COPY_EXTENSIONS
+
+# Report header and label styling (immutable openpyxl value objects, shared
+# by every report's named styles)
+_HDR_FILL = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+_HDR_FONT = Font(color='FFFFFF', bold=True)
+_HDR_ALIGN = Alignment(horizontal='center')
+_BOLD = Font(bold=True)
+_LEFT_ALIGN = Alignment(horizontal='left')
+
+# Tracker workbooks ('Anon Tracker - X.xlsx' etc.) are never processed or copied
+_TRACKER_RE = re.compile(r'tracker', re.IGNORECASE)
+
+# Output directories known to exist in this process (see ensure_dir)
+_ENSURED_DIRS = set()
+
+# Per-process alias state for parallel workers, set once by _worker_init so
+# individual tasks don't re-pickle the alias map and compiled patterns
+_WORKER_STATE = {}
 
 # ANSI color codes for terminal output
 class Colors:
@@ -60,11 +140,34 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
+class FileDetail(NamedTuple):
+    """Per-file record, in the report's File Details column order"""
+    file_path: str
+    folder: str
+    filename: str
+    extension: str
+    status: str
+    replacements: int
+    images_removed: int
+    hyperlinks_removed: int
+    processing_time: float  # Seconds, rounded to 2 places
+    error: str
+
+
+class CopiedFile(NamedTuple):
+    """Non-processable file copied as-is, in the report's Copied Files column order"""
+    original_path: str
+    output_path: str
+    file_type: str
+    filename: str
+
+
 class BatchStats:
     """Tracks comprehensive statistics during batch processing"""
 
     def __init__(self):
         self.start_time = datetime.now()
+        self.start_monotonic = time.monotonic()  # For elapsed time (cheaper, immune to clock changes)
         self.files_processed = 0
         self.files_succeeded = 0
         self.files_failed = 0
@@ -81,14 +184,14 @@ class BatchStats:
         self.copied_files_count = 0      # Non-processable files copied as-is
 
         # Detailed tracking
-        self.file_details = []  # List of dicts for per-file stats
+        self.file_details = []  # FileDetail per file (appended to the report as-is)
         self.folder_stats = defaultdict(lambda: {
             'files': 0, 'succeeded': 0, 'failed': 0, 'skipped': 0,
             'replacements': 0, 'images_removed': 0, 'hyperlinks_removed': 0
         })
-        self.replacement_frequency = defaultdict(int)  # Track which replacements used
+        self.replacement_frequency = Counter()  # Total occurrences per original across all files
         self.error_log = []  # Detailed error information
-        self.copied_files = []  # Track non-processable files copied as-is
+        self.copied_files = []  # CopiedFile per non-processable file copied as-is
         self.file_replacement_details = []  # Per-file detailed replacements (v2.1)
 
     def add_file_result(self, file_path: Path, relative_path: Path, status: str,
@@ -97,7 +200,9 @@ class BatchStats:
                        processing_time: float = 0, error_msg: str = "",
                        replacement_details: dict = None):
         """Record result for a single file"""
-        folder_name = str(relative_path.parent) if relative_path.parent != Path('.') else 'root'
+        relative_str = str(relative_path)
+        parent = relative_path.parent
+        folder_name = str(parent) if parent.parts else 'root'
 
         # Update counters
         self.files_processed += 1
@@ -112,46 +217,41 @@ class BatchStats:
             self.files_skipped += 1
 
         # Store detailed record
-        self.file_details.append({
-            'file_path': str(relative_path),
-            'folder': folder_name,
-            'filename': file_path.name,
-            'extension': file_path.suffix,
-            'status': status,
-            'replacements': replacements,
-            'images_removed': images_removed,
-            'hyperlinks_removed': hyperlinks_removed,
-            'processing_time': processing_time,
-            'error': error_msg
-        })
+        self.file_details.append(FileDetail(
+            relative_str, folder_name, file_path.name, file_path.suffix, status,
+            replacements, images_removed, hyperlinks_removed,
+            round(processing_time, 2), error_msg
+        ))
 
         # Store per-file replacement details (v2.1)
         if replacement_details and status == 'success':
+            self.replacement_frequency.update(replacement_details)  # Counter merge runs in C
             self.file_replacement_details.append({
-                'file_path': str(relative_path),
+                'file_path': relative_str,
                 'directory': folder_name,
                 'filename': file_path.name,
                 'details': replacement_details  # {original: count, ...}
             })
 
         # Update folder stats
-        self.folder_stats[folder_name]['files'] += 1
+        folder = self.folder_stats[folder_name]
+        folder['files'] += 1
         if status == 'success':
-            self.folder_stats[folder_name]['succeeded'] += 1
-            self.folder_stats[folder_name]['replacements'] += replacements
-            self.folder_stats[folder_name]['images_removed'] += images_removed
-            self.folder_stats[folder_name]['hyperlinks_removed'] += hyperlinks_removed
+            folder['succeeded'] += 1
+            folder['replacements'] += replacements
+            folder['images_removed'] += images_removed
+            folder['hyperlinks_removed'] += hyperlinks_removed
         elif status == 'failed':
-            self.folder_stats[folder_name]['failed'] += 1
+            folder['failed'] += 1
         elif status == 'skipped':
-            self.folder_stats[folder_name]['skipped'] += 1
+            folder['skipped'] += 1
 
         # Store error if present
         if error_msg:
             self.error_log.append({
-                'file_path': str(relative_path),
+                'file_path': relative_str,
                 'error': error_msg,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'timestamp': time.time()  # Epoch seconds, formatted when the report is written
             })
 
     def add_pdf_result(self, success: bool):
@@ -163,8 +263,8 @@ class BatchStats:
 
     def get_elapsed_time(self) -> str:
         """Get formatted elapsed time"""
-        elapsed = datetime.now() - self.start_time
-        minutes, seconds = divmod(elapsed.total_seconds(), 60)
+        elapsed = time.monotonic() - self.start_monotonic
+        minutes, seconds = divmod(elapsed, 60)
         return f"{int(minutes)}m {int(seconds)}s"
 
     def get_summary(self, include_pdf: bool = True) -> str:
@@ -180,8 +280,8 @@ class BatchStats:
         # This could indicate processor caught exception and returned (0,0,0)
         suspicious_files = [
             f for f in self.file_details
-            if f['status'] == 'success' and f['replacements'] == 0 and f['images_removed'] == 0
-            and f['extension'] in ['.docx', '.pptx', '.xlsx']  # Only check processable types
+            if f.status == 'success' and f.replacements == 0 and f.images_removed == 0
+            and f.extension in ['.docx', '.pptx', '.xlsx']  # Only check processable types
         ]
 
         # Primary integrity check: file counts match
@@ -238,46 +338,80 @@ class BatchStats:
 
 
 class ProgressDisplay:
-    """Real-time terminal progress display"""
+    """Real-time terminal progress display (single status line, redrawn in place)"""
+
+    # Minimum seconds between redraws on a terminal, and between lines when
+    # output is redirected to a file
+    TTY_INTERVAL = 0.1
+    LOG_INTERVAL = 5.0
+
+    BAR_LENGTH = 30
+    STATUS_TEMPLATE = (
+        f"{Colors.BOLD}{Colors.BLUE}[{{bar}}] {{percent:5.1f}}%{Colors.ENDC} "
+        f"{{current}}/{{total}} | "
+        f"{Colors.GREEN}✓ {{succeeded}}{Colors.ENDC} "
+        f"{Colors.RED}✗ {{failed}}{Colors.ENDC} "
+        f"{Colors.YELLOW}⊘ {{skipped}}{Colors.ENDC} | "
+        f"Repl: {{replacements:,}} | {{elapsed}} | "
+        f"{Colors.CYAN}{{current_file}}{Colors.ENDC}"
+    )
 
     def __init__(self, total_files: int):
         self.total_files = total_files
         self.current = 0
-        self.last_update = time.time()
+        self.last_update = 0.0
+        self.is_tty = sys.stdout.isatty()
+        self.line_open = False
+        # Every possible bar, indexed by the number of filled cells
+        self.bars = ['█' * filled + '░' * (self.BAR_LENGTH - filled)
+                     for filled in range(self.BAR_LENGTH + 1)]
 
     def update(self, current_file: str, stats: BatchStats):
-        """Update progress display"""
+        """Update progress display (throttled; the last file always renders)"""
         self.current += 1
 
+        now = time.monotonic()
+        interval = self.TTY_INTERVAL if self.is_tty else self.LOG_INTERVAL
+        if now - self.last_update < interval and self.current < self.total_files:
+            return
+        self.last_update = now
+
         # Calculate progress
         progress = self.current / max(self.total_files, 1)
-        bar_length = 40
-        filled = int(bar_length * progress)
-        bar = '█' * filled + '░' * (bar_length - filled)
-
-        # Clear previous lines (move cursor up 5 lines and clear)
-        if self.current > 1:
-            sys.stdout.write('\033[5A\033[J')
-
-        # Print updated display
-        print(f"\n{Colors.BOLD}{Colors.BLUE}Progress: [{bar}] {progress*100:.1f}%{Colors.ENDC}")
-        print(f"{Colors.BOLD}Files:{Colors.ENDC} {self.current}/{self.total_files} | "
-              f"{Colors.GREEN}Success: {stats.files_succeeded}{Colors.ENDC} | "
-              f"{Colors.RED}Failed: {stats.files_failed}{Colors.ENDC} | "
-              f"{Colors.YELLOW}Skipped: {stats.files_skipped}{Colors.ENDC}")
-        print(f"{Colors.BOLD}Stats:{Colors.ENDC} Replacements: {stats.total_replacements:,} | "
-              f"Images Removed: {stats.total_images_removed:,}")
-        print(f"{Colors.BOLD}Time:{Colors.ENDC} {stats.get_elapsed_time()}")
-        print(f"{Colors.CYAN}Current:{Colors.ENDC} {current_file[:70]}")
+        filled = min(int(self.BAR_LENGTH * progress), self.BAR_LENGTH)
+
+        status = self.STATUS_TEMPLATE.format(
+            bar=self.bars[filled], percent=progress * 100,
+            current=self.current, total=self.total_files,
+            succeeded=stats.files_succeeded, failed=stats.files_failed,
+            skipped=stats.files_skipped, replacements=stats.total_replacements,
+            elapsed=stats.get_elapsed_time(), current_file=current_file[-40:]
+        )
 
+        if self.is_tty:
+            # Redraw the status line in place
+            sys.stdout.write('\r\033[K' + status)
+            self.line_open = True
+            if self.current >= self.total_files:
+                self.end_line()
+        else:
+            sys.stdout.write(status + '\n')
         sys.stdout.flush()
 
+    def end_line(self):
+        """Finish the in-place status line so other output starts on a fresh line"""
+        if self.line_open:
+            sys.stdout.write('\n')
+            sys.stdout.flush()
+            self.line_open = False
 
-def setup_logging(log_dir: Path) -> logging.Logger:
+
+def setup_logging(log_dir: Path, timestamp: Optional[str] = None) -> logging.Logger:
     """Setup dual logging (file + console)"""
     log_dir.mkdir(parents=True, exist_ok=True)
 
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    if timestamp is None:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     log_file = log_dir / f"batch_run_{timestamp}.log"
 
     # Create logger
@@ -310,28 +444,137 @@ def setup_logging(log_dir: Path) -> logging.Logger:
     return logger
 
 
-def get_folder_info(folder_path: Path, input_dir: Path) -> Dict:
-    """Get information about a folder for prompting"""
-    # Find all processable files in this folder tree (recursive)
-    docx_files = list(folder_path.rglob('*.docx'))
-    xlsx_files = list(folder_path.rglob('*.xlsx'))
-    xlsm_files = list(folder_path.rglob('*.xlsm'))  # Excel macro-enabled workbooks
-    pptx_files = list(folder_path.rglob('*.pptx'))
-    doc_files = list(folder_path.rglob('*.doc'))
-    xls_files = list(folder_path.rglob('*.xls'))
-    ppt_files = list(folder_path.rglob('*.ppt'))
+def ensure_dir(directory: Path):
+    """
+    mkdir -p, remembering directories already created by this process
+
+    Files in one output folder share their parent chain, so repeated
+    mkdir(parents=True) calls are skipped after the first.
+    """
+    key = str(directory)
+    if key in _ENSURED_DIRS:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    _ENSURED_DIRS.add(key)
+    _ENSURED_DIRS.update(str(parent) for parent in directory.parents)
+
+
+def is_tracker_file(file_path: Path) -> bool:
+    """Tracker workbooks live alongside the documents but are never processed"""
+    return _TRACKER_RE.search(file_path.name) is not None
+
+
+def walk_classify(root: Path, directories: Optional[List[Path]] = None,
+                  extensions: Optional[frozenset] = None) -> Tuple[Dict[str, List[Path]], int]:
+    """
+    Walk a folder tree once, bucketing files by lowercase extension
+
+    Uses os.scandir so each entry's type comes from the directory listing
+    instead of a separate stat() per rglob pattern. Like rglob, symlinked
+    directories are not followed.
+
+    Args:
+        directories: Optional list to append every subdirectory Path to
+        extensions: Optional set of lowercase extensions to keep; other
+                    files are skipped before a Path is built for them
+
+    Returns:
+        Tuple of (files_by_extension, subdirectory_count)
+    """
+    buckets = defaultdict(list)
+    subdir_count = 0
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    subdir_count += 1
+                    if directories is not None:
+                        directories.append(Path(entry.path))
+                else:
+                    ext = os.path.splitext(entry.name)[1].lower()
+                    if (extensions is None or ext in extensions) and entry.is_file():
+                        buckets[ext].append(Path(entry.path))
+    return buckets, subdir_count
+
+
+def group_by_top_folder(input_dir: Path, files_by_ext: Dict[str, List[Path]],
+                        directories: List[Path]) -> Dict[Path, Tuple[Dict[str, List[Path]], int]]:
+    """
+    Split one walk_classify result for input_dir by top-level folder
+
+    Each value has the shape walk_classify(top_folder) would return, with
+    files in the same order (the walk finishes one subtree before starting
+    the next), so per-folder summaries don't need to walk again. input_dir
+    itself maps to the whole tree, as a recursive walk of it would.
+
+    Returns:
+        Dict of top-level folder -> (files_by_extension, subdirectory_count)
+    """
+    root_depth = len(input_dir.parts)
+    grouped = {input_dir: (files_by_ext, len(directories))}
+    by_name = {}
+
+    def folder_entry(path: Path):
+        name = path.parts[root_depth]
+        entry = by_name.get(name)
+        if entry is None:
+            entry = by_name[name] = (defaultdict(list), [0])
+        return entry
+
+    for directory in directories:
+        if len(directory.parts) > root_depth + 1:
+            folder_entry(directory)[1][0] += 1
+    for ext, files in files_by_ext.items():
+        for file_path in files:
+            if len(file_path.parts) > root_depth + 1:
+                folder_entry(file_path)[0][ext].append(file_path)
+
+    for name, (buckets, subdirs) in by_name.items():
+        grouped[input_dir / name] = (buckets, subdirs[0])
+    return grouped
+
+
+def get_folder_info(folder_path: Path, input_dir: Path,
+                    classified: Optional[Tuple[Dict[str, List[Path]], int]] = None) -> Dict:
+    """
+    Get information about a folder for prompting
+
+    Args:
+        classified: walk_classify-shaped result for folder_path (see
+                    group_by_top_folder); the folder is walked if omitted
+    """
+    # Find all processable files in this folder tree (recursive, single walk)
+    if classified is None:
+        classified = walk_classify(folder_path, extensions=FOLDER_INFO_EXTENSIONS)
+    files_by_ext, subdirs_count = classified
+    docx_files = files_by_ext['.docx']
+    xlsx_files = files_by_ext['.xlsx']
+    xlsm_files = files_by_ext['.xlsm']  # Excel macro-enabled workbooks
+    pptx_files = files_by_ext['.pptx']
+    doc_files = files_by_ext['.doc']
+    xls_files = files_by_ext['.xls']
+    ppt_files = files_by_ext['.ppt']
 
     # Also find non-processable files
-    pdf_files = list(folder_path.rglob('*.pdf'))
-    png_files = list(folder_path.rglob('*.png'))
-    jpg_files = list(folder_path.rglob('*.jpg'))
-    jpeg_files = list(folder_path.rglob('*.jpeg'))
+    pdf_files = files_by_ext['.pdf']
+    png_files = files_by_ext['.png']
+    jpg_files = files_by_ext['.jpg']
+    jpeg_files = files_by_ext['.jpeg']
 
     # Filter out tracker files from processable files
-    processable_files = docx_files + xlsx_files + xlsm_files + pptx_files + doc_files + xls_files + ppt_files
-    processable_files = [f for f in processable_files if 'tracker' not in f.name.lower() and 'anon tracker' not in f.name.lower()]
+    # (counted while streaming over the buckets; only the first 5 names are kept)
+    file_count = 0
+    sample_files = []
+    for f in chain(docx_files, xlsx_files, xlsm_files, pptx_files, doc_files, xls_files, ppt_files):
+        if not is_tracker_file(f):
+            file_count += 1
+            if len(sample_files) < 5:
+                sample_files.append(f.name)
 
-    non_processable_files = pdf_files + png_files + jpg_files + jpeg_files
+    non_processable_total = len(pdf_files) + len(png_files) + len(jpg_files) + len(jpeg_files)
 
     # Get file type breakdown
     type_counts = {
@@ -350,14 +593,8 @@ def get_folder_info(folder_path: Path, input_dir: Path) -> Dict:
     # Filter to only non-zero counts
     non_processable_counts = {k: v for k, v in non_processable_counts.items() if v > 0}
 
-    # Get sample filenames (first 5 processable)
-    sample_files = [f.name for f in processable_files[:5]]
-
-    # Get subdirectories in this folder
-    subdirs = [d.relative_to(folder_path) for d in folder_path.rglob('*') if d.is_dir()]
-
     # Estimate processing time (rough: 5 seconds per file)
-    est_time_seconds = len(processable_files) * 5
+    est_time_seconds = file_count * 5
     est_minutes = est_time_seconds / 60
 
     # Get relative path
@@ -368,14 +605,14 @@ def get_folder_info(folder_path: Path, input_dir: Path) -> Dict:
 
     return {
         'path': relative_path,
-        'file_count': len(processable_files),
+        'file_count': file_count,
         'type_counts': type_counts,
         'non_processable_counts': non_processable_counts,
-        'non_processable_total': len(non_processable_files),
+        'non_processable_total': non_processable_total,
         'sample_files': sample_files,
-        'subdirs_count': len(subdirs),
+        'subdirs_count': subdirs_count,
         'est_minutes': est_minutes,
-        'has_warnings': len(non_processable_files) > 0
+        'has_warnings': non_processable_total > 0
     }
 
 
@@ -501,168 +738,335 @@ def should_remove_images_for_file(file_relative_path: Path, folder_default: bool
     return folder_default
 
 
-def convert_legacy_format(file_path: Path, output_dir: Path, logger: logging.Logger) -> Optional[Path]:
+def legacy_conversion_dir(file_path: Path, input_dir: Path, output_dir: Path) -> Path:
+    """Temp directory for a legacy file's converted copy (mirrors the input tree so names can't collide)"""
+    return output_dir / '.temp_conversions' / file_path.parent.relative_to(input_dir)
+
+
+def detect_container(file_path: Path) -> str:
     """
-    Convert legacy formats (.doc, .xls, .ppt) to modern formats using LibreOffice
+    Identify a file's container format from its first bytes
 
     Returns:
-        Path to converted file, or None if conversion failed
+        'ooxml' (ZIP package), 'cfb' (legacy compound file) or 'unknown'
     """
-    extension = file_path.suffix.lower()
+    try:
+        with open(file_path, 'rb') as f:
+            signature = f.read(8)
+    except OSError:
+        return 'unknown'
+    if signature.startswith(ZIP_MAGIC):
+        return 'ooxml'
+    if signature.startswith(CFB_MAGIC):
+        return 'cfb'
+    return 'unknown'
+
+
+def resolve_legacy_without_conversion(file_path: Path, temp_dir: Path,
+                                      logger: logging.Logger) -> Tuple[bool, Optional[Path]]:
+    """
+    Handle legacy-named files that don't need LibreOffice
 
-    # Create temp directory for conversion
-    temp_dir = output_dir / '.temp_conversions'
-    temp_dir.mkdir(parents=True, exist_ok=True)
+    A renamed OOXML file (e.g. a .docx saved as .doc) is linked into temp_dir
+    under its real extension; a file that is neither OOXML nor a compound
+    file is rejected without paying a LibreOffice start and timeout.
 
-    # Determine output format
-    format_map = {
-        '.doc': 'docx',
-        '.xls': 'xlsx',
-        '.ppt': 'pptx'
-    }
+    Returns:
+        Tuple of (resolved, path): resolved is False when the file still
+        needs converting; path is None for rejected files
+    """
+    container = detect_container(file_path)
+    if container == 'cfb':
+        return False, None
 
-    if extension not in format_map:
-        return file_path  # Not a legacy format
+    if container == 'ooxml':
+        ensure_dir(temp_dir)
+        output_file = temp_dir / f"{file_path.stem}.{LEGACY_FORMATS[file_path.suffix.lower()]}"
+        link_or_copy(file_path, output_file)
+        logger.info(f"{file_path.name} is already in OOXML format - skipped conversion")
+        return True, output_file
 
-    output_format = format_map[extension]
-    output_file = temp_dir / f"{file_path.stem}.{output_format}"
+    logger.warning(f"{file_path.name} is not a recognizable Office file - skipped conversion")
+    return True, None
 
-    try:
-        logger.info(f"Converting {file_path.name} from {extension} to .{output_format}")
-
-        # LibreOffice conversion command
-        cmd = [
-            'libreoffice',
-            '--headless',
-            '--convert-to', output_format,
-            '--outdir', str(temp_dir),
-            str(file_path)
-        ]
 
-        # Increase timeout for Excel files (can be large/complex)
-        timeout_seconds = 600 if extension == '.xls' else 300
+def convert_legacy_format(file_path: Path, output_dir: Path, logger: logging.Logger,
+                          temp_dir: Optional[Path] = None) -> Optional[Path]:
+    """
+    Convert a single legacy file (.doc, .ppt) to its modern format using LibreOffice
 
-        result = subprocess.run(
-            cmd,
-            timeout=timeout_seconds,
-            capture_output=True,
-            text=True
-        )
+    Batch runs pre-convert whole folders with convert_legacy_formats; this is
+    the one-off fallback.
 
-        if result.returncode == 0 and output_file.exists():
-            logger.info(f"Successfully converted to {output_file.name}")
-            return output_file
-        else:
-            # Log detailed error information
-            error_details = f"Return code: {result.returncode}"
-            if result.stderr:
-                error_details += f"\nStderr: {result.stderr.strip()}"
-            if result.stdout:
-                error_details += f"\nStdout: {result.stdout.strip()}"
-            logger.error(f"Conversion failed for {file_path.name}: {error_details}")
-
-            # For .xls files, warn that they cannot be processed
-            if extension == '.xls':
-                logger.warning(f"Legacy .xls file cannot be converted. File will be copied as-is to output (not anonymized): {file_path.name}")
-
-            return None
-
-    except subprocess.TimeoutExpired:
-        logger.error(f"Conversion timeout ({timeout_seconds}s) for {file_path.name}")
-        return None
+    Returns:
+        Path to converted file, or None if conversion failed
+    """
+    extension = file_path.suffix.lower()
+    if extension not in LEGACY_FORMATS:
+        return file_path  # Not a legacy format
+
+    # Create temp directory for conversion
+    if temp_dir is None:
+        temp_dir = output_dir / '.temp_conversions'
+    ensure_dir(temp_dir)
+
+    resolved, output_file = resolve_legacy_without_conversion(file_path, temp_dir, logger)
+    if resolved:
+        return output_file
+
+    output_format = LEGACY_FORMATS[extension]
+    logger.info(f"Converting {file_path.name} from {extension} to .{output_format}")
+    try:
+        outputs, timed_out = convert_batch(
+            [file_path], output_format, temp_dir, timeout=LEGACY_TIMEOUT_PER_FILE,
+            logger=logger
+        )
     except Exception as e:
         logger.error(f"Conversion error for {file_path.name}: {str(e)}")
         return None
 
+    output_file = outputs[file_path]
+    if output_file is not None:
+        logger.info(f"Successfully converted to {output_file.name}")
+    elif file_path in timed_out:
+        logger.error(f"Conversion timeout ({LEGACY_TIMEOUT_PER_FILE}s) for {file_path.name}")
+    else:
+        logger.error(f"Conversion failed for {file_path.name}")
+    return output_file
+
 
-def convert_to_pdf(file_path: Path, pdf_output_dir: Path, logger: logging.Logger) -> bool:
+def convert_legacy_formats(files: List[Path], input_dir: Path, output_dir: Path,
+                           logger: logging.Logger) -> Dict[Path, Optional[Path]]:
     """
-    Convert document to PDF using LibreOffice
+    Convert every legacy file (.doc, .ppt) in a list with batched LibreOffice runs
 
     Returns:
-        True if conversion succeeded, False otherwise
+        Dict mapping each legacy input file to its converted path (None if conversion failed)
     """
+    def log_result(input_file, output_file, timed_out):
+        if output_file is not None:
+            logger.info(f"Converted {input_file.name} to {output_file.name}")
+        elif timed_out:
+            logger.error(f"Conversion timeout for {input_file.name}")
+        else:
+            error = batcher.errors.get(input_file)
+            logger.error(f"Conversion failed for {input_file.name}" + (f": {error}" if error else ""))
+
+    legacy_files = [f for f in files if f.suffix.lower() in LEGACY_FORMATS]
+    if not legacy_files:
+        return {}
+
+    # Renamed OOXML files and unrecognizable files don't need LibreOffice
+    conversions = {}
+    to_convert = []
+    for file_path in legacy_files:
+        resolved, output_file = resolve_legacy_without_conversion(
+            file_path, legacy_conversion_dir(file_path, input_dir, output_dir), logger
+        )
+        if resolved:
+            conversions[file_path] = output_file
+        else:
+            to_convert.append(file_path)
+    if not to_convert:
+        return conversions
+
+    logger.info(f"Converting {len(to_convert)} legacy files with LibreOffice")
+    with LibreOfficeBatcher(timeout_per_file=LEGACY_TIMEOUT_PER_FILE,
+                            batch_size=LIBREOFFICE_BATCH_SIZE,
+                            on_result=log_result, logger=logger) as batcher:
+        for file_path in to_convert:
+            batcher.enqueue_convert(
+                file_path, LEGACY_FORMATS[file_path.suffix.lower()],
+                legacy_conversion_dir(file_path, input_dir, output_dir)
+            )
+    conversions.update((f, batcher.results.get(f)) for f in to_convert)
+    return conversions
+
+
+def file_sha256(file_path: Path) -> str:
+    """SHA-256 hex digest of a file's contents, read in 1 MiB chunks"""
+    with open(file_path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+def output_code_digest() -> str:
+    """SHA-256 hex digest of the OUTPUT_CACHE_SOURCES files (names and contents)"""
+    repo_root = Path(__file__).resolve().parent.parent
+    sources = sorted(chain.from_iterable(repo_root.glob(pattern) for pattern in OUTPUT_CACHE_SOURCES))
+    digest = hashlib.sha256()
+    for source in sources:
+        digest.update(source.relative_to(repo_root).as_posix().encode('utf-8'))
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def output_cache_salt(alias_map: Dict) -> str:
+    """Digest of everything run-wide that affects outputs (cache version, code, alias mappings)"""
+    payload = json.dumps([OUTPUT_CACHE_VERSION, output_code_digest(), sorted(alias_map.items())],
+                         ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def output_cache_key(content_digest: str, cache_salt: str, remove_images: bool, remove_hyperlinks: bool) -> str:
+    """Re-run cache key: the original input's content (file_sha256) plus the run's aliases and options"""
+    return f"{content_digest}:{cache_salt}:{int(remove_images)}{int(remove_hyperlinks)}"
+
+
+def cached_output_entry(output_cache: Optional[Dict], cache_key: Optional[str],
+                        output_dir: Path) -> Optional[Dict]:
+    """Re-run cache entry for a key, if its output is still there unchanged (same size and mtime)"""
+    entry = output_cache.get(cache_key) if output_cache and cache_key is not None else None
+    if entry is None:
+        return None
     try:
-        # Ensure output directory exists
-        pdf_output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Expected PDF filename
-        pdf_file = pdf_output_dir / f"{file_path.stem}.pdf"
-
-        # LibreOffice PDF conversion
-        cmd = [
-            'libreoffice',
-            '--headless',
-            '--convert-to', 'pdf',
-            '--outdir', str(pdf_output_dir),
-            str(file_path)
-        ]
+        output_stat = (output_dir / entry['output_relpath']).stat()
+    except OSError:
+        return None  # Previous output gone or unreadable - reprocess
+    if (output_stat.st_size, output_stat.st_mtime_ns) != (entry['size'], entry['mtime_ns']):
+        return None
+    return entry
 
-        result = subprocess.run(
-            cmd,
-            timeout=300,  # 5 minute timeout
-            capture_output=True,
-            text=True
-        )
 
-        if result.returncode == 0 and pdf_file.exists():
-            logger.debug(f"PDF conversion successful: {pdf_file.name}")
-            return True
-        else:
-            logger.debug(f"PDF conversion failed for {file_path.name}: {result.stderr}")
-            return False
+def load_output_cache(output_dir: Path, logger: logging.Logger) -> Dict:
+    """Load the re-run cache from a previous run into this output directory"""
+    cache_path = output_dir / OUTPUT_CACHE_FILENAME
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable cache {cache_path}: {str(e)}")
+        return {}
+
+
+def save_output_cache(output_dir: Path, output_cache: Dict, logger: logging.Logger):
+    """Write the re-run cache atomically (a crash never leaves a truncated file)"""
+    cache_path = output_dir / OUTPUT_CACHE_FILENAME
+    temp_path = cache_path.with_suffix('.tmp')
+    try:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(output_cache, f, ensure_ascii=False)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Failed to save cache {cache_path}: {str(e)}")
 
-    except subprocess.TimeoutExpired:
-        logger.debug(f"PDF conversion timeout for {file_path.name}")
-        return False
-    except Exception as e:
-        logger.debug(f"PDF conversion error for {file_path.name}: {str(e)}")
-        return False
+
+def legacy_conversion_failed_result(file_path: Path, processing_time: float = 0) -> Dict:
+    """Result for a legacy file LibreOffice couldn't convert (copied as-is, not anonymized)"""
+    return {
+        'status': 'skipped',
+        'replacements': 0,
+        'images_removed': 0,
+        'error': f"Legacy {file_path.suffix.lower()} file cannot be converted - will be copied as-is (not anonymized)",
+        'processing_time': processing_time
+    }
 
 
 def process_file(file_path: Path, input_dir: Path, output_dir: Path, pdf_output_dir: Path,
                 alias_map: Dict, sorted_keys: List, compiled_patterns: Dict,
                 logger: logging.Logger, remove_images: bool = True,
                 remove_hyperlinks: bool = False,
-                generate_pdf: bool = True, timestamp_suffix: str = "") -> Dict:
+                timestamp_suffix: str = "",
+                converted_path: Optional[Path] = None,
+                output_cache: Optional[Dict] = None,
+                cache_salt: str = "",
+                cache_key: Optional[str] = None,
+                relative_path: Optional[Path] = None) -> Dict:
     """
-    Process a single file (anonymize and optionally convert to PDF)
+    Process a single file (anonymize only; PDFs are batched by the caller
+    from the returned output_path and pdf_dir)
+
+    Args:
+        converted_path: Modern-format copy of a legacy file from
+                        convert_legacy_formats (converted here if omitted)
+        output_cache: Re-run cache entries (see load_output_cache); an input
+                      whose content and options match an entry reuses that
+                      output. Successful results carry 'cache_key' so the
+                      caller can record them.
+        cache_salt: output_cache_salt of the run's alias map
+        cache_key: output_cache_key of this file, if the caller already
+                   hashed it (computed here otherwise)
+        relative_path: file_path relative to input_dir, if the caller
+                       already has it (computed here otherwise)
 
     Returns:
         Dict with processing results
     """
-    start_time = time.time()
-    relative_path = file_path.relative_to(input_dir)
-
-    # Determine file type
-    extension = file_path.suffix.lower()
+    start_time = time.perf_counter()
+    if relative_path is None:
+        relative_path = file_path.relative_to(input_dir)
+
+    # Key the re-run cache on the original input's content and the options
+    if output_cache is None:
+        cache_key = None
+    elif cache_key is None:
+        try:
+            cache_key = output_cache_key(file_sha256(file_path), cache_salt, remove_images, remove_hyperlinks)
+        except OSError:
+            cache_key = None
 
-    # Handle legacy .doc and .ppt formats via LibreOffice conversion
+    # Determine file type; legacy .doc and .ppt files are anonymized in
+    # their modern format, so their outputs take its extension
     # Note: .xls files are handled directly with pandas (see routing below)
-    if extension in ['.doc', '.ppt']:
-        converted_path = convert_legacy_format(file_path, output_dir, logger)
-        if converted_path is None:
-            # Conversion failed - file will be copied as-is (not anonymized)
-            return {
-                'status': 'skipped',
-                'replacements': 0,
-                'images_removed': 0,
-                'error': f"Legacy {extension} file cannot be converted - will be copied as-is (not anonymized)",
-                'processing_time': time.time() - start_time
-            }
-        file_path = converted_path
-        extension = file_path.suffix.lower()
-        # Update relative path to reflect new extension
-        relative_path = Path(str(relative_path).replace(relative_path.suffix, extension))
+    extension = file_path.suffix.lower()
+    legacy = extension in LEGACY_FORMATS
+    if legacy:
+        extension = f".{LEGACY_FORMATS[extension]}"
+        relative_path = relative_path.with_suffix(extension)
 
     # Determine output paths
     # Preserve entire folder structure including root folder name with optional timestamp
     root_folder_name = f"{input_dir.name}{timestamp_suffix}"
     output_path = output_dir / root_folder_name / relative_path
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    ensure_dir(output_path.parent)
 
     pdf_path = pdf_output_dir / root_folder_name / relative_path.with_suffix('.pdf')
-    pdf_path.parent.mkdir(parents=True, exist_ok=True)
+    ensure_dir(pdf_path.parent)
+
+    # Unchanged since a previous run: reuse its output instead of reprocessing
+    # (checked before any legacy conversion, which a hit makes unnecessary)
+    entry = cached_output_entry(output_cache, cache_key, output_dir)
+    if entry is not None:
+        cached_output = output_dir / entry['output_relpath']
+        try:
+            if cached_output != output_path:
+                shutil.copy2(cached_output, output_path)
+            logger.info(f"Identical input already processed (this or a previous run), reused output: {relative_path}")
+            return {
+                'status': 'success',
+                'replacements': entry['replacements'],
+                'images_removed': entry['images_removed'],
+                'hyperlinks_removed': entry['hyperlinks_removed'],
+                'error': '',
+                'processing_time': time.perf_counter() - start_time,
+                'replacement_details': entry['replacement_details'],
+                'output_path': str(output_path),
+                'pdf_dir': str(pdf_path.parent),
+                'cache_key': cache_key,
+                'cached_pdf': entry.get('pdf')
+            }
+        except OSError:
+            pass  # Previous output unreadable - reprocess
+
+    # Convert legacy .doc and .ppt files via LibreOffice (unless the caller
+    # already did)
+    if legacy:
+        if converted_path is None:
+            converted_path = convert_legacy_format(
+                file_path, output_dir, logger,
+                legacy_conversion_dir(file_path, input_dir, output_dir)
+            )
+        if converted_path is None:
+            # Conversion failed - file will be copied as-is (not anonymized)
+            return legacy_conversion_failed_result(file_path, time.perf_counter() - start_time)
+        file_path = converted_path
 
     try:
         # Route to appropriate processor (v2.1: with detailed tracking)
@@ -676,7 +1080,8 @@ def process_file(file_path: Path, input_dir: Path, output_dir: Path, pdf_output_
                 remove_images=remove_images,
                 remove_hyperlinks=remove_hyperlinks,
                 clear_headers_footers_flag=False,
-                track_details=True
+                track_details=True,
+                compiled_patterns=compiled_patterns
             )
 
         elif extension == '.pptx':
@@ -717,7 +1122,7 @@ def process_file(file_path: Path, input_dir: Path, output_dir: Path, pdf_output_
                 'replacements': 0,
                 'images_removed': 0,
                 'error': f"Unsupported file type: {extension}",
-                'processing_time': time.time() - start_time
+                'processing_time': time.perf_counter() - start_time
             }
 
         # CRITICAL: Verify output file was actually created (prevents silent failures)
@@ -731,7 +1136,7 @@ def process_file(file_path: Path, input_dir: Path, output_dir: Path, pdf_output_
                 'images_removed': 0,
                 'hyperlinks_removed': 0,
                 'error': error_msg,
-                'processing_time': time.time() - start_time,
+                'processing_time': time.perf_counter() - start_time,
                 'replacement_details': {}
             }
 
@@ -745,11 +1150,10 @@ def process_file(file_path: Path, input_dir: Path, output_dir: Path, pdf_output_
                 'images_removed': 0,
                 'hyperlinks_removed': 0,
                 'error': error_msg,
-                'processing_time': time.time() - start_time,
+                'processing_time': time.perf_counter() - start_time,
                 'replacement_details': {}
             }
 
-        # PDF conversion (optional)
         result_dict = {
             'status': 'success',
             'replacements': replacements,
@@ -757,15 +1161,13 @@ def process_file(file_path: Path, input_dir: Path, output_dir: Path, pdf_output_
             'hyperlinks_removed': hyperlinks_removed,
             'error': '',
             'processing_time': 0,  # Will be set below
-            'replacement_details': replacement_details  # v2.1
+            'replacement_details': replacement_details,  # v2.1
+            'output_path': str(output_path),
+            'pdf_dir': str(pdf_path.parent),
+            'cache_key': cache_key
         }
 
-        # Only attempt PDF conversion and track result if PDF generation is enabled
-        if generate_pdf and output_path.exists():
-            pdf_success = convert_to_pdf(output_path, pdf_path.parent, logger)
-            result_dict['pdf_success'] = pdf_success
-
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
         result_dict['processing_time'] = processing_time
         logger.info(f"Completed {relative_path}: {replacements} replacements, "
                    f"{images_removed} images removed in {processing_time:.1f}s")
@@ -780,64 +1182,64 @@ def process_file(file_path: Path, input_dir: Path, output_dir: Path, pdf_output_
             'replacements': 0,
             'images_removed': 0,
             'error': error_msg,
-            'processing_time': time.time() - start_time
+            'processing_time': time.perf_counter() - start_time
         }
 
 
-def copy_non_processable_files(input_dir: Path, output_dir: Path, timestamp_suffix: str, logger: logging.Logger, stats: 'BatchStats') -> int:
+def copy_non_processable_files(input_dir: Path, output_dir: Path, timestamp_suffix: str, logger: logging.Logger, stats: 'BatchStats',
+                               files_by_ext: Optional[Dict[str, List[Path]]] = None) -> int:
     """
     Copy non-processable files (PDFs, images, etc.) to output directory
     to preserve complete folder structure.
 
     Args:
         stats: BatchStats object to track copied files
+        files_by_ext: walk_classify result for input_dir, if the caller
+                      already walked it (walked here otherwise)
 
     Returns:
         Number of files copied
     """
     logger.info("Copying non-processable files to output...")
 
-    # Extensions that should be copied as-is
-    copy_extensions = {'.pdf', '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.txt',
-                      '.csv', '.json', '.xml', '.html', '.htm', '.zip', '.tar', '.gz'}
-
-    # Tracker files to skip
-    skip_patterns = ['tracker', 'anon tracker']
-
     files_copied = 0
     root_folder_name = f"{input_dir.name}{timestamp_suffix}"
 
-    # Find all files in input directory
-    for file_path in input_dir.rglob('*'):
-        if not file_path.is_file():
-            continue
-
+    # Find all copyable files in input directory (single scandir walk)
+    if files_by_ext is None:
+        files_by_ext, _ = walk_classify(input_dir, extensions=COPY_EXTENSIONS)
+    copies = []
+    for file_path in (f for ext in sorted(COPY_EXTENSIONS) for f in files_by_ext.get(ext, ())):
         # Skip tracker files
-        if any(pattern in file_path.name.lower() for pattern in skip_patterns):
+        if is_tracker_file(file_path):
             continue
 
-        # Check if file should be copied
-        if file_path.suffix.lower() in copy_extensions:
-            # Calculate relative path and output path
-            relative_path = file_path.relative_to(input_dir)
-            output_path = output_dir / root_folder_name / relative_path
-
-            # Create parent directories if needed
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Copy file
+        # Calculate relative path and output path
+        relative_path = file_path.relative_to(input_dir)
+        output_path = output_dir / root_folder_name / relative_path
+
+        # Create parent directories if needed
+        ensure_dir(output_path.parent)
+        copies.append((file_path, relative_path, output_path))
+
+    # Copy files on a small thread pool: copy2 releases the GIL in its
+    # syscalls (in-kernel sendfile/fcopyfile), so per-file open/close and
+    # I/O latency overlap across files
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+        futures = [pool.submit(shutil.copy2, file_path, output_path)
+                   for file_path, _, output_path in copies]
+
+        # Record results in discovery order
+        for (file_path, relative_path, output_path), future in zip(copies, futures):
             try:
-                shutil.copy2(file_path, output_path)
+                future.result()
                 files_copied += 1
-                logger.debug(f"Copied: {relative_path}")
+                logger.debug("Copied: %s", relative_path)
 
                 # Track copied file
-                stats.copied_files.append({
-                    'original_path': str(relative_path),
-                    'output_path': str(output_dir / root_folder_name / relative_path),
-                    'file_type': file_path.suffix.lower(),
-                    'filename': file_path.name
-                })
+                stats.copied_files.append(CopiedFile(
+                    str(relative_path), str(output_path), file_path.suffix.lower(), file_path.name
+                ))
             except Exception as e:
                 logger.warning(f"Failed to copy {relative_path}: {str(e)}")
 
@@ -848,9 +1250,14 @@ def copy_non_processable_files(input_dir: Path, output_dir: Path, timestamp_suff
     return files_copied
 
 
-def preserve_empty_folders(input_dir: Path, output_dir: Path, timestamp_suffix: str, logger: logging.Logger):
+def preserve_empty_folders(input_dir: Path, output_dir: Path, timestamp_suffix: str, logger: logging.Logger,
+                           directories: Optional[List[Path]] = None):
     """
     Create empty directories in output to match input structure.
+
+    Args:
+        directories: Every subdirectory of input_dir, if the caller already
+                     collected them with walk_classify (walked here otherwise)
     """
     logger.info("Preserving empty folder structure...")
 
@@ -858,143 +1265,177 @@ def preserve_empty_folders(input_dir: Path, output_dir: Path, timestamp_suffix:
     folders_created = 0
 
     # Find all directories in input
-    for dir_path in input_dir.rglob('*'):
-        if not dir_path.is_dir():
-            continue
+    if directories is None:
+        directories = []
+        walk_classify(input_dir, directories)
 
+    for dir_path in directories:
         # Calculate relative path and output path
         try:
             relative_path = dir_path.relative_to(input_dir)
             output_path = output_dir / root_folder_name / relative_path
 
-            # Create directory if it doesn't exist
-            if not output_path.exists():
-                output_path.mkdir(parents=True, exist_ok=True)
+            # Create directory if it doesn't exist (ones this process made
+            # for output files are known without a stat)
+            if str(output_path) not in _ENSURED_DIRS and not output_path.exists():
+                ensure_dir(output_path)
                 folders_created += 1
-                logger.debug(f"Created empty folder: {relative_path}")
+                logger.debug("Created empty folder: %s", relative_path)
         except Exception as e:
             logger.warning(f"Failed to create directory {dir_path}: {str(e)}")
 
     logger.info(f"Created {folders_created} empty folders")
 
 
-def discover_files(input_dir: Path, logger: logging.Logger) -> Tuple[Dict[Path, List[Path]], int, int]:
+def largest_first(files: List[Path]) -> List[Path]:
+    """
+    Order files by size, largest first, for submission to the process pool
+
+    Longest-processing-time-first scheduling: starting the big documents
+    early keeps one late large file from leaving the other workers idle
+    at the end of a folder. Files that can't be stat'ed sort last.
+    """
+    sizes = {}
+    for file_path in files:
+        try:
+            sizes[file_path] = file_path.stat().st_size
+        except OSError:
+            sizes[file_path] = -1
+    return sorted(files, key=sizes.__getitem__, reverse=True)
+
+
+def discover_files(input_dir: Path, logger: logging.Logger,
+                   files_by_ext: Optional[Dict[str, List[Path]]] = None) -> Tuple[Dict[Path, List[Path]], int, int]:
     """
     Discover all processable files organized by top-level folder
 
+    Args:
+        files_by_ext: walk_classify result for input_dir, if the caller
+                      already walked it (walked here otherwise)
+
     Returns:
         Tuple of (folder_files_dict, total_discovered, tracker_files_excluded)
     """
     logger.info("Discovering files in folder structure...")
 
-    # Supported extensions
-    extensions = ['*.docx', '*.xlsx', '*.xlsm', '*.pptx', '*.doc', '*.xls', '*.ppt']
-
-    # Find all files
+    # Find all processable files (single walk), setting tracker files aside
+    if files_by_ext is None:
+        files_by_ext, _ = walk_classify(input_dir, extensions=PROCESSABLE_EXTENSIONS)
     all_files = []
-    for ext in extensions:
-        all_files.extend(input_dir.rglob(ext))
-
-    total_discovered = len(all_files)
-
-    # Filter out tracker files
-    tracker_files = [f for f in all_files if 'tracker' in f.name.lower() or 'anon tracker' in f.name.lower()]
-    all_files = [f for f in all_files if 'tracker' not in f.name.lower() and 'anon tracker' not in f.name.lower()]
+    tracker_files_excluded = 0
+    for ext, files in files_by_ext.items():
+        if ext not in PROCESSABLE_EXTENSIONS:
+            continue
+        for file_path in files:
+            if is_tracker_file(file_path):
+                tracker_files_excluded += 1
+            else:
+                all_files.append(file_path)
 
-    tracker_files_excluded = len(tracker_files)
+    total_discovered = len(all_files) + tracker_files_excluded
 
-    # Organize by top-level folder
+    # Organize by top-level folder. Every file came from walking input_dir,
+    # so the top-level folder is the path component right below it (no
+    # per-file relative_to); each folder's Path is built once.
     folder_files = defaultdict(list)
+    top_folders = {}
+    root_depth = len(input_dir.parts)
 
     for file_path in all_files:
-        try:
-            relative = file_path.relative_to(input_dir)
-
-            # Get top-level folder (or root if file is directly in input_dir)
-            if len(relative.parts) > 1:
-                top_folder = input_dir / relative.parts[0]
-            else:
-                top_folder = input_dir
+        parts = file_path.parts
+
+        # Get top-level folder (or root if file is directly in input_dir)
+        if len(parts) > root_depth + 1:
+            name = parts[root_depth]
+            top_folder = top_folders.get(name)
+            if top_folder is None:
+                top_folder = top_folders[name] = input_dir / name
+        else:
+            top_folder = input_dir
 
-            folder_files[top_folder].append(file_path)
-        except ValueError:
-            logger.warning(f"Skipping file outside input directory: {file_path}")
+        folder_files[top_folder].append(file_path)
 
     # Log discovery results
     logger.info(f"Discovered {total_discovered} total files ({tracker_files_excluded} tracker files excluded)")
     logger.info(f"Processing {len(all_files)} processable files in {len(folder_files)} top-level folders")
-    for folder, files in sorted(folder_files.items()):
-        try:
-            folder_rel = folder.relative_to(input_dir)
-        except ValueError:
-            folder_rel = folder
-        logger.info(f"  {folder_rel}: {len(files)} files")
+    if logger.isEnabledFor(logging.INFO):
+        for folder, files in sorted(folder_files.items()):
+            try:
+                folder_rel = folder.relative_to(input_dir)
+            except ValueError:
+                folder_rel = folder
+            logger.info("  %s: %d files", folder_rel, len(files))
 
     return folder_files, total_discovered, tracker_files_excluded
 
 
 def generate_excel_report(stats: BatchStats, report_path: Path, alias_map: Dict, logger: logging.Logger):
-    """Generate comprehensive Excel report with replacement and copied files details"""
-    try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill
-        from openpyxl.utils import get_column_letter
+    """
+    Generate comprehensive Excel report with replacement and copied files details
 
+    The workbook is write-only, so rows are streamed to disk as they are
+    appended instead of being held as cell objects. Column widths must be
+    set before a sheet's first row, and only header/label cells are styled.
+    """
+    try:
         logger.info(f"Generating Excel report: {report_path}")
 
-        wb = Workbook()
+        wb = Workbook(write_only=True)
+
+        # Header and label styles are registered once as named styles, so
+        # each styled cell is a single style reference
+        header_style = NamedStyle(name='report_header')
+        header_style.fill = _HDR_FILL
+        header_style.font = _HDR_FONT
+        header_style.alignment = _HDR_ALIGN
+        wb.add_named_style(header_style)
+
+        label_style = NamedStyle(name='report_label')
+        label_style.font = _BOLD
+        label_style.alignment = _LEFT_ALIGN
+        wb.add_named_style(label_style)
+
+        def styled_cell(ws, value, style):
+            """Write-only cell using one of the named styles"""
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            return cell
+
+        def header_row(ws, headers):
+            """Styled header cells for a write-only sheet"""
+            return [styled_cell(ws, header, 'report_header') for header in headers]
+
+        def set_widths(ws, widths):
+            """Set column widths (before the sheet's first row is appended)"""
+            for column, width in widths.items():
+                ws.column_dimensions[column].width = width
+
+        # Replacement text and action type shown per alias, computed once
+        # for the Mappings and Detailed Replacements sheets
+        display_map = {k: ("[DELETED]" if v == "" else v) for k, v in alias_map.items()}
+        action_map = {k: ("DELETION (blank)" if v == "" else "REPLACEMENT") for k, v in alias_map.items()}
 
         # Sheet 1: File Details
-        ws_files = wb.active
-        ws_files.title = "File Details"
+        ws_files = wb.create_sheet("File Details")
 
         headers = ['File Path', 'Folder', 'Filename', 'Type', 'Status',
                   'Replacements', 'Images Removed', 'Hyperlinks Removed', 'Processing Time (s)', 'Error']
-        ws_files.append(headers)
-
-        # Style headers
-        header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-        header_font = Font(color='FFFFFF', bold=True)
-        for col_num, header in enumerate(headers, 1):
-            cell = ws_files.cell(1, col_num)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center')
-
-        # Add file data
-        for detail in stats.file_details:
-            ws_files.append([
-                detail['file_path'],
-                detail['folder'],
-                detail['filename'],
-                detail['extension'],
-                detail['status'],
-                detail['replacements'],
-                detail['images_removed'],
-                detail.get('hyperlinks_removed', 0),
-                round(detail['processing_time'], 2),
-                detail['error']
-            ])
+        set_widths(ws_files, {'A': 50, 'B': 15, 'C': 15, 'D': 15, 'E': 15,
+                              'F': 15, 'G': 15, 'H': 15, 'I': 40, 'J': 15})
+        ws_files.append(header_row(ws_files, headers))
 
-        # Auto-size columns
-        for col_num in range(1, len(headers) + 1):
-            ws_files.column_dimensions[get_column_letter(col_num)].width = 15
-        ws_files.column_dimensions['A'].width = 50
-        ws_files.column_dimensions['I'].width = 40
+        # Add file data (records are already in column order)
+        for detail in stats.file_details:
+            ws_files.append(detail)
 
         # Sheet 2: Folder Summary
         ws_folders = wb.create_sheet("Folder Summary")
 
         folder_headers = ['Folder', 'Total Files', 'Succeeded', 'Failed', 'Skipped',
                          'Replacements', 'Images Removed', 'Hyperlinks Removed', 'Success Rate (%)']
-        ws_folders.append(folder_headers)
-
-        # Style headers
-        for col_num, header in enumerate(folder_headers, 1):
-            cell = ws_folders.cell(1, col_num)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center')
+        set_widths(ws_folders, {'A': 40, 'B': 15, 'C': 15, 'D': 15, 'E': 15,
+                                'F': 15, 'G': 15, 'H': 15, 'I': 15})
+        ws_folders.append(header_row(ws_folders, folder_headers))
 
         # Add folder data
         for folder_name, folder_data in sorted(stats.folder_stats.items()):
@@ -1011,11 +1452,6 @@ def generate_excel_report(stats: BatchStats, report_path: Path, alias_map: Dict,
                 round(success_rate, 1)
             ])
 
-        # Auto-size columns
-        for col_num in range(1, len(folder_headers) + 1):
-            ws_folders.column_dimensions[get_column_letter(col_num)].width = 15
-        ws_folders.column_dimensions['A'].width = 40
-
         # Sheet 3: Run Summary
         ws_summary = wb.create_sheet("Run Summary")
 
@@ -1039,144 +1475,85 @@ def generate_excel_report(stats: BatchStats, report_path: Path, alias_map: Dict,
             ['Total Processing Time', stats.get_elapsed_time()]
         ]
 
-        for row in summary_data:
-            ws_summary.append(row)
-
-        # Style summary
-        for row_num in range(1, len(summary_data) + 1):
-            cell_a = ws_summary.cell(row_num, 1)
-            cell_a.font = Font(bold=True)
-            cell_a.alignment = Alignment(horizontal='left')
+        set_widths(ws_summary, {'A': 30, 'B': 30})
 
-        ws_summary.column_dimensions['A'].width = 30
-        ws_summary.column_dimensions['B'].width = 30
+        # Style summary (bold, left-aligned labels)
+        for label, value in summary_data:
+            ws_summary.append([styled_cell(ws_summary, label, 'report_label'), value])
 
         # Sheet 4: Error Log (if any errors)
         if stats.error_log:
             ws_errors = wb.create_sheet("Error Log")
             error_headers = ['Timestamp', 'File Path', 'Error Message']
-            ws_errors.append(error_headers)
-
-            # Style headers
-            for col_num, header in enumerate(error_headers, 1):
-                cell = ws_errors.cell(1, col_num)
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center')
+            set_widths(ws_errors, {'A': 20, 'B': 50, 'C': 60})
+            ws_errors.append(header_row(ws_errors, error_headers))
 
             # Add error data
             for error in stats.error_log:
                 ws_errors.append([
-                    error['timestamp'],
+                    datetime.fromtimestamp(error['timestamp']).strftime('%Y-%m-%d %H:%M:%S'),
                     error['file_path'],
                     error['error']
                 ])
 
-            ws_errors.column_dimensions['A'].width = 20
-            ws_errors.column_dimensions['B'].width = 50
-            ws_errors.column_dimensions['C'].width = 60
-
         # Sheet 5: Anonymization Mappings
         ws_mappings = wb.create_sheet("Anonymization Mappings")
-        mapping_headers = ['Original Text', 'Replacement Text', 'Action Type']
-        ws_mappings.append(mapping_headers)
-
-        # Style headers
-        for col_num, header in enumerate(mapping_headers, 1):
-            cell = ws_mappings.cell(1, col_num)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center')
+        mapping_headers = ['Original Text', 'Replacement Text', 'Action Type', 'Total Occurrences']
+        set_widths(ws_mappings, {'A': 40, 'B': 40, 'C': 20, 'D': 18})
+        ws_mappings.append(header_row(ws_mappings, mapping_headers))
 
         # Add mapping data
-        for original, replacement in sorted(alias_map.items()):
-            action_type = "DELETION (blank)" if replacement == "" else "REPLACEMENT"
-            ws_mappings.append([original, replacement if replacement != "" else "[DELETED]", action_type])
-
-        ws_mappings.column_dimensions['A'].width = 40
-        ws_mappings.column_dimensions['B'].width = 40
-        ws_mappings.column_dimensions['C'].width = 20
+        for original in sorted(alias_map):
+            ws_mappings.append([original, display_map[original], action_map[original],
+                                stats.replacement_frequency[original]])
 
         # Sheet 6: Copied Files (Non-Processable)
         if stats.copied_files:
             ws_copied = wb.create_sheet("Copied Files")
             copied_headers = ['Original Path', 'Output Location', 'File Type', 'Filename']
-            ws_copied.append(copied_headers)
+            set_widths(ws_copied, {'A': 50, 'B': 60, 'C': 15, 'D': 40})
+            ws_copied.append(header_row(ws_copied, copied_headers))
 
-            # Style headers
-            for col_num, header in enumerate(copied_headers, 1):
-                cell = ws_copied.cell(1, col_num)
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center')
-
-            # Add copied file data
+            # Add copied file data (records are already in column order)
             for file_info in stats.copied_files:
-                ws_copied.append([
-                    file_info['original_path'],
-                    file_info['output_path'],
-                    file_info['file_type'],
-                    file_info['filename']
-                ])
-
-            ws_copied.column_dimensions['A'].width = 50
-            ws_copied.column_dimensions['B'].width = 60
-            ws_copied.column_dimensions['C'].width = 15
-            ws_copied.column_dimensions['D'].width = 40
+                ws_copied.append(file_info)
 
         # Sheet 7: Detailed Replacements by Document (v2.1)
         if stats.file_replacement_details:
             ws_details = wb.create_sheet("Detailed Replacements")
             details_headers = ["File Path", "Directory", "Document", "Original Text", "Replacement", "Occurrences", "Action Type"]
-            ws_details.append(details_headers)
-
-            # Style headers
-            for col_num, header in enumerate(details_headers, 1):
-                cell = ws_details.cell(1, col_num)
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center')
-
-            # Add detailed replacement data
-            rows = []
-            for file_info in stats.file_replacement_details:
+            set_widths(ws_details, {
+                'A': 50,  # File Path
+                'B': 25,  # Directory
+                'C': 40,  # Document
+                'D': 30,  # Original Text
+                'E': 30,  # Replacement
+                'F': 12,  # Occurrences
+                'G': 20,  # Action Type
+            })
+            ws_details.append(header_row(ws_details, details_headers))
+
+            # Add detailed replacement data, sorted by file path then by
+            # occurrences (descending). Each file appears once, so sorting the
+            # files and then each file's own details gives that order while
+            # streaming rows straight into the sheet (no list of every row)
+            for file_info in sorted(stats.file_replacement_details, key=itemgetter('file_path')):
                 file_path = file_info['file_path']
                 directory = file_info['directory']
                 filename = file_info['filename']
                 details = file_info['details']  # {original: count, ...}
 
                 # Create a row for each original → replacement
-                for original, count in sorted(details.items(), key=lambda x: x[1], reverse=True):
-                    # Look up replacement from alias_map
-                    replacement = alias_map.get(original, "[UNKNOWN]")
-                    action_type = "DELETION (blank)" if replacement == "" else "REPLACEMENT"
-                    display_replacement = "[DELETED]" if replacement == "" else replacement
-
-                    rows.append([
+                for original, count in sorted(details.items(), key=itemgetter(1), reverse=True):
+                    ws_details.append((
                         file_path,
                         directory,
                         filename,
                         original,
-                        display_replacement,
+                        display_map.get(original, "[UNKNOWN]"),
                         count,
-                        action_type
-                    ])
-
-            # Sort rows by file path, then by occurrences (descending)
-            rows.sort(key=lambda x: (x[0], -x[5]))
-
-            # Add all rows
-            for row in rows:
-                ws_details.append(row)
-
-            # Set column widths
-            ws_details.column_dimensions['A'].width = 50  # File Path
-            ws_details.column_dimensions['B'].width = 25  # Directory
-            ws_details.column_dimensions['C'].width = 40  # Document
-            ws_details.column_dimensions['D'].width = 30  # Original Text
-            ws_details.column_dimensions['E'].width = 30  # Replacement
-            ws_details.column_dimensions['F'].width = 12  # Occurrences
-            ws_details.column_dimensions['G'].width = 20  # Action Type
+                        action_map.get(original, "REPLACEMENT")
+                    ))
 
         # Save workbook
         wb.save(report_path)
@@ -1186,25 +1563,67 @@ def generate_excel_report(stats: BatchStats, report_path: Path, alias_map: Dict,
         logger.error(f"Failed to generate Excel report: {str(e)}")
 
 
+def _worker_init(alias_map: Dict, sorted_keys: List, pattern_source: Dict, log_file: str,
+                 compiled_patterns: Optional[Dict] = None):
+    """
+    ProcessPoolExecutor initializer: prepare a worker process once.
+
+    Re-applies the OOXML int() patches (spawned workers start from a fresh
+    interpreter), compiles the combined pattern built by the parent (once per
+    worker, not per file) unless it was inherited, and attaches a file-only
+    logger to the main run's log.
+
+    Args:
+        alias_map: Original -> replacement mappings loaded from the tracker
+        sorted_keys: Alias keys from categorize_and_sort_aliases
+        pattern_source: Plain pattern data from build_pattern_source
+        log_file: Path of the main process's log file (appended to)
+        compiled_patterns: The parent's compiled patterns when workers are
+            forked (inherited as-is, nothing to compile); None when spawned
+    """
+    apply_ooxml_patches()  # No-op when inherited by fork or applied on import
+
+    logger = logging.getLogger(f'batch_anonymizer.worker_{os.getpid()}')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False  # Forked workers inherit the console handler
+    logger.handlers = []
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter(
+        '%(asctime)s | %(levelname)-8s | [worker %(process)d] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    ))
+    logger.addHandler(file_handler)
+
+    _WORKER_STATE.update(
+        alias_map=alias_map,
+        sorted_keys=sorted_keys,
+        compiled_patterns=compiled_patterns or compile_pattern_source(pattern_source),
+        logger=logger
+    )
+
+
 def process_file_parallel_wrapper(args_tuple):
     """
     Wrapper function for parallel file processing.
 
-    This function is called by multiprocessing.Pool workers.
+    This function is called by ProcessPoolExecutor workers initialized with
+    _worker_init, which holds the alias map, patterns and logger.
     It unpacks arguments and calls process_file, returning results.
 
     Args:
         args_tuple: Tuple of (file_path, input_dir, output_dir, pdf_output_dir,
-                             alias_map, sorted_keys, compiled_patterns, remove_images,
-                             remove_hyperlinks, generate_pdf, timestamp_suffix,
-                             folder_specific_removal, relative_path)
+                             remove_images, remove_hyperlinks, timestamp_suffix,
+                             folder_specific_removal, relative_path, converted_path,
+                             cache_key, cache_entry) where cache_key is None
+                             when the file couldn't be hashed and cache_entry
+                             is the main process's current entry for it
 
     Returns:
         Dict with file processing results including relative_path for identification
     """
-    (file_path, input_dir, output_dir, pdf_output_dir, alias_map, sorted_keys,
-     compiled_patterns, remove_images, remove_hyperlinks, generate_pdf,
-     timestamp_suffix, folder_specific_removal, relative_path_str) = args_tuple
+    (file_path, input_dir, output_dir, pdf_output_dir, remove_images,
+     remove_hyperlinks, timestamp_suffix, folder_specific_removal,
+     relative_path_str, converted_path, cache_key, cache_entry) = args_tuple
 
     # Reconstruct Path objects (can't pickle Path directly in some Python versions)
     file_path = Path(file_path)
@@ -1212,12 +1631,8 @@ def process_file_parallel_wrapper(args_tuple):
     output_dir = Path(output_dir)
     pdf_output_dir = Path(pdf_output_dir)
     relative_path = Path(relative_path_str)
-
-    # Setup a simple logger for this worker (file logging only, no console spam)
-    import logging
-    logger = logging.getLogger(f'worker_{os.getpid()}')
-    logger.setLevel(logging.INFO)
-    logger.handlers = []  # Clear any existing handlers
+    if converted_path is not None:
+        converted_path = Path(converted_path)
 
     # Check if this file should have images removed (subfolder-level check)
     file_remove_images = should_remove_images_for_file(
@@ -1228,11 +1643,16 @@ def process_file_parallel_wrapper(args_tuple):
     try:
         result = process_file(
             file_path, input_dir, output_dir, pdf_output_dir,
-            alias_map, sorted_keys, compiled_patterns,
-            logger, remove_images=file_remove_images,
+            _WORKER_STATE['alias_map'], _WORKER_STATE['sorted_keys'],
+            _WORKER_STATE['compiled_patterns'], _WORKER_STATE['logger'],
+            remove_images=file_remove_images,
             remove_hyperlinks=remove_hyperlinks,
-            generate_pdf=generate_pdf,
-            timestamp_suffix=timestamp_suffix
+            timestamp_suffix=timestamp_suffix,
+            converted_path=converted_path,
+            output_cache=None if cache_key is None else (
+                {cache_key: cache_entry} if cache_entry is not None else {}),
+            cache_key=cache_key,
+            relative_path=relative_path
         )
 
         # Add identifying information to result
@@ -1257,6 +1677,99 @@ def process_file_parallel_wrapper(args_tuple):
         }
 
 
+def result_pdf_path(result: Dict) -> Path:
+    """Where a process_file result's PDF goes (next to its siblings in pdf_dir)"""
+    return Path(result['pdf_dir']) / f"{Path(result['output_path']).stem}.pdf"
+
+
+def reuse_cached_pdf(result: Dict) -> bool:
+    """
+    Copy the PDF a previous run made for a reused output into place, if it
+    still exists unchanged, so LibreOffice is skipped. (Copied like the
+    reused output itself: a hard link would tie separate deliverables to
+    one inode.)
+
+    Args:
+        result: Cache-hit result from process_file carrying 'cached_pdf'
+                ([pdf path, size, mtime_ns] recorded by the earlier run)
+    """
+    cached_pdf = result.get('cached_pdf')
+    if not cached_pdf:
+        return False
+    cached_path = Path(cached_pdf[0])
+    pdf_path = result_pdf_path(result)
+    try:
+        pdf_stat = cached_path.stat()
+        if [pdf_stat.st_size, pdf_stat.st_mtime_ns] != cached_pdf[1:]:
+            return False
+        if cached_path != pdf_path:
+            shutil.copy2(cached_path, pdf_path)
+    except OSError:
+        return False
+    return True
+
+
+def record_file_result(stats: 'BatchStats', file_path: Path, relative_path: Path,
+                       result: Dict, pdf_batcher: Optional[LibreOfficeBatcher],
+                       output_cache: Optional[Dict] = None, output_dir: Optional[Path] = None,
+                       pdf_cache_keys: Optional[Dict] = None,
+                       pdf_duplicates: Optional[Dict] = None):
+    """
+    Add one process_file result to the run stats and re-run cache, and queue
+    its PDF conversion (or reuse the PDF of an identical file)
+
+    Args:
+        pdf_cache_keys: Output path -> cache key of queued conversions, so
+                        the PDF callback can record finished PDFs in the cache
+        pdf_duplicates: Cache key of each queued conversion -> PDF paths of
+                        identical files waiting to share its PDF
+    """
+    stats.add_file_result(
+        file_path, relative_path, result['status'],
+        result['replacements'], result['images_removed'],
+        result.get('hyperlinks_removed', 0),
+        result['processing_time'], result.get('error', ''),
+        replacement_details=result.get('replacement_details', {})
+    )
+
+    entry = None
+    if output_cache is not None and result.get('cache_key') and result['status'] == 'success':
+        # A reused output keeps its entry (and any PDF recorded for it since)
+        if 'cached_pdf' in result:
+            entry = output_cache.get(result['cache_key'])
+        if entry is not None:
+            result['cached_pdf'] = entry.get('pdf')
+        else:
+            output_path = Path(result['output_path'])
+            output_stat = output_path.stat()
+            entry = output_cache[result['cache_key']] = {
+                'output_relpath': str(output_path.relative_to(output_dir)),
+                'size': output_stat.st_size,
+                'mtime_ns': output_stat.st_mtime_ns,
+                'replacements': result['replacements'],
+                'images_removed': result['images_removed'],
+                'hyperlinks_removed': result.get('hyperlinks_removed', 0),
+                'replacement_details': result.get('replacement_details', {})
+            }
+
+    # PDF results are tracked by the batcher's callback as groups finish
+    if pdf_batcher is not None and 'output_path' in result:
+        if reuse_cached_pdf(result):
+            stats.add_pdf_result(True)
+            if entry is not None:
+                entry['pdf'] = result['cached_pdf']
+            return
+        if entry is not None and pdf_cache_keys is not None:
+            # An identical file's PDF is still converting: share it when done
+            if pdf_duplicates is not None and result['cache_key'] in pdf_duplicates:
+                pdf_duplicates[result['cache_key']].append(result_pdf_path(result))
+                return
+            pdf_cache_keys[result['output_path']] = result['cache_key']
+            if pdf_duplicates is not None:
+                pdf_duplicates[result['cache_key']] = []
+        pdf_batcher.enqueue_convert(result['output_path'], 'pdf', result['pdf_dir'])
+
+
 def main():
     """Main batch processing function"""
     parser = argparse.ArgumentParser(
@@ -1297,8 +1810,12 @@ Examples:
                        help='Add timestamp to output folder names (prevents overwriting previous runs)')
     parser.add_argument('--remove-hyperlinks', action='store_true',
                        help='Remove hyperlink metadata from all documents (preserves text, default: OFF)')
-    parser.add_argument('--parallel-workers', type=int, default=1,
-                       help='Number of parallel workers for file processing (default: 1 = sequential). Recommended: 6-8 for high-RAM systems. Higher values = faster but more RAM usage.')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Reprocess every file, even ones unchanged since the last run into this output directory '
+                            '(identical files within a run are still processed once)')
+    parser.add_argument('-j', '--jobs', '--parallel-workers', dest='jobs', type=int,
+                       default=max(1, available_cpu_count() - 1),
+                       help='Number of worker processes for file processing (default: CPU cores - 1; 1 = sequential). Higher values = faster but more RAM usage.')
 
     args = parser.parse_args()
 
@@ -1313,10 +1830,14 @@ Examples:
     else:
         pdf_output_dir = Path(__file__).parent / 'pdf_output'
 
+    # One run timestamp names the log, the report and (if requested) the
+    # output folders, so they always match
+    run_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
     # Generate timestamp for folder naming if requested
     timestamp_suffix = ""
     if args.timestamp_output:
-        timestamp_suffix = f"_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        timestamp_suffix = f"_{run_timestamp}"
 
     # Validate inputs
     if not input_dir.exists():
@@ -1328,16 +1849,17 @@ Examples:
         sys.exit(1)
 
     # Validate parallel workers
-    cpu_count = multiprocessing.cpu_count()
-    if args.parallel_workers < 1:
-        print(f"{Colors.RED}Error: --parallel-workers must be >= 1{Colors.ENDC}")
+    cpu_count = available_cpu_count()
+    if args.jobs < 1:
+        print(f"{Colors.RED}Error: --jobs must be >= 1{Colors.ENDC}")
         sys.exit(1)
-    if args.parallel_workers > cpu_count * 2:
-        print(f"{Colors.YELLOW}Warning: --parallel-workers ({args.parallel_workers}) exceeds 2x CPU cores ({cpu_count}). This may slow performance.{Colors.ENDC}")
+    if args.jobs > cpu_count * 2:
+        print(f"{Colors.YELLOW}Warning: --jobs ({args.jobs}) exceeds 2x CPU cores ({cpu_count}). This may slow performance.{Colors.ENDC}")
 
     # Setup logging
     log_dir = Path(__file__).parent / 'logs'
-    logger = setup_logging(log_dir)
+    logger = setup_logging(log_dir, run_timestamp)
+    log_file = next(h.baseFilename for h in logger.handlers if isinstance(h, logging.FileHandler))
 
     # Print banner
     print(f"""
@@ -1359,7 +1881,8 @@ Examples:
     try:
         alias_map = load_aliases_from_excel(str(tracker_path))
         sorted_keys = categorize_and_sort_aliases(alias_map)
-        compiled_patterns = precompile_patterns(alias_map)
+        pattern_source = build_pattern_source(alias_map)
+        compiled_patterns = compile_pattern_source(pattern_source)
         print(f"{Colors.GREEN}✓ Loaded {len(alias_map)} anonymization mappings{Colors.ENDC}")
         logger.info(f"Loaded {len(alias_map)} anonymization mappings from {tracker_path}")
     except Exception as e:
@@ -1372,7 +1895,12 @@ Examples:
 
     # Discover files
     print(f"\n{Colors.BOLD}Discovering files...{Colors.ENDC}")
-    folder_files, total_discovered, tracker_excluded = discover_files(input_dir, logger)
+    # One walk of the input tree feeds discovery, the per-folder prompts and
+    # the final copy / empty-folder pass
+    input_directories = []
+    input_files_by_ext, _ = walk_classify(input_dir, input_directories, SCAN_EXTENSIONS)
+    folder_files, total_discovered, tracker_excluded = discover_files(input_dir, logger, input_files_by_ext)
+    folder_classification = group_by_top_folder(input_dir, input_files_by_ext, input_directories)
 
     # Update stats for data integrity tracking
     stats.input_files_discovered = total_discovered
@@ -1392,7 +1920,7 @@ Examples:
         print(f"\n{Colors.YELLOW}{Colors.BOLD}DRY RUN MODE - Preview Only{Colors.ENDC}")
         total_warnings = 0
         for folder_path in sorted(folder_files.keys()):
-            folder_info = get_folder_info(folder_path, input_dir)
+            folder_info = get_folder_info(folder_path, input_dir, folder_classification[folder_path])
             print(f"\n{Colors.BOLD}Folder:{Colors.ENDC} {folder_info['path']}")
             print(f"  Processable files: {folder_info['file_count']}")
             type_str = " | ".join([f"{k}: {v}" for k, v in folder_info['type_counts'].items() if v > 0])
@@ -1430,32 +1958,255 @@ Examples:
 
     # Process each folder
     print(f"\n{Colors.BOLD}{Colors.GREEN}Starting batch processing...{Colors.ENDC}")
-    if args.parallel_workers > 1:
-        print(f"{Colors.CYAN}Parallel mode: {args.parallel_workers} workers (CPU cores: {cpu_count}){Colors.ENDC}")
-        print(f"{Colors.CYAN}Progress updates will be shown per folder batch{Colors.ENDC}\n")
+    if args.jobs > 1:
+        print(f"{Colors.CYAN}Parallel mode: {args.jobs} workers (CPU cores: {cpu_count}){Colors.ENDC}")
+        print(f"{Colors.CYAN}Files are queued as each folder is confirmed; progress is shown as they complete{Colors.ENDC}\n")
     else:
-        print(f"{Colors.CYAN}Sequential mode (use --parallel-workers N for faster processing){Colors.ENDC}\n")
-
-    progress = ProgressDisplay(total_files) if args.parallel_workers == 1 else None
-
+        print(f"{Colors.CYAN}Sequential mode (use --jobs N for faster processing){Colors.ENDC}\n")
+
+    progress = ProgressDisplay(total_files)
+
+    # Anonymized files are queued for PDF conversion as they complete and
+    # converted in batches (one soffice run per output folder group) on
+    # background threads, overlapping LibreOffice with anonymization
+    pdf_batcher = None
+    pdf_executor = None
+    pdf_cache_keys = {}
+    pdf_duplicates = {}
+    if not args.no_pdf:
+        def record_pdf_result(input_file, pdf_file, timed_out):
+            cache_key = pdf_cache_keys.pop(str(input_file), None)
+            duplicates = pdf_duplicates.pop(cache_key, ()) if cache_key is not None else ()
+            stats.add_pdf_result(pdf_file is not None)
+            if pdf_file is None:
+                reason = 'timeout' if timed_out else pdf_batcher.errors.get(input_file, 'conversion failed')
+                logger.debug("PDF conversion failed for %s: %s", input_file.name, reason)
+                for _ in duplicates:
+                    stats.add_pdf_result(False)
+                return
+
+            # Identical files get a copy of this PDF instead of their own conversion
+            for duplicate_pdf in duplicates:
+                try:
+                    shutil.copy2(pdf_file, duplicate_pdf)
+                    stats.add_pdf_result(True)
+                except OSError as e:
+                    logger.debug("PDF copy failed for %s: %s", duplicate_pdf.name, str(e))
+                    stats.add_pdf_result(False)
+
+            # Remember the PDF so a re-run with this output unchanged reuses it
+            if cache_key is not None and cache_key in output_cache:
+                try:
+                    pdf_stat = pdf_file.stat()
+                    output_cache[cache_key]['pdf'] = [str(pdf_file), pdf_stat.st_size, pdf_stat.st_mtime_ns]
+                except OSError:
+                    pass
+
+        pdf_executor = ThreadPoolExecutor(max_workers=PDF_WORKERS)
+        pdf_batcher = LibreOfficeBatcher(timeout_per_file=PDF_TIMEOUT_PER_FILE,
+                                         batch_size=LIBREOFFICE_BATCH_SIZE,
+                                         on_result=record_pdf_result,
+                                         executor=pdf_executor, logger=logger)
+
+    # Re-runs into the same output directory reuse outputs of unchanged files;
+    # with --no-cache the entries only live for this run (identical files in
+    # it are still processed once)
+    output_cache = {} if args.no_cache else load_output_cache(output_dir, logger)
+    cache_salt = output_cache_salt(alias_map)
+    if output_cache:
+        logger.info(f"Loaded re-run cache with {len(output_cache)} entries")
+
+    # Hash inputs on background threads in the order they will be submitted,
+    # so reading them overlaps with processing instead of delaying the first
+    # tasks. Without the re-run cache only files sharing a size with another
+    # input can be duplicates; the rest are never hashed.
+    input_sizes = {}
+    for files in folder_files.values():
+        for file_path in files:
+            try:
+                input_sizes[file_path] = file_path.stat().st_size
+            except OSError:
+                pass
+    size_counts = Counter(input_sizes.values())
+    hash_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS)
+    file_digests = {}
     for folder_path in sorted(folder_files.keys()):
         files = folder_files[folder_path]
+        for file_path in largest_first(files) if args.jobs > 1 else files:
+            if file_path in input_sizes and (not args.no_cache or size_counts[input_sizes[file_path]] > 1):
+                file_digests[file_path] = hash_executor.submit(file_sha256, file_path)
+
+    cache_keys = {}
+
+    def file_cache_key(file_path, remove_images):
+        """Cache key of an input from its background hash (None if not hashed)"""
+        if file_path not in cache_keys:
+            cache_key = None
+            digest = file_digests.get(file_path)
+            if digest is not None:
+                try:
+                    file_remove_images = should_remove_images_for_file(
+                        file_path.relative_to(input_dir), remove_images, folder_specific_removal
+                    )
+                    cache_key = output_cache_key(digest.result(), cache_salt, file_remove_images,
+                                                 args.remove_hyperlinks)
+                except OSError:
+                    pass
+            cache_keys[file_path] = cache_key
+        return cache_keys[file_path]
+
+    # Workers get the alias map once via the initializer; each task only
+    # carries paths and per-folder options
+    executor = None
+    pending = {}
+    folder_outstanding = {}
+
+    # Identical inputs (same content and options) share one re-run cache key.
+    # While one copy is in the pool its duplicates wait here, then go to the
+    # pool with the finished entry and just reuse its output
+    inflight_keys = set()
+    waiting_on_key = defaultdict(list)
+
+    def submit_task(task, file_path, relative_path, folder_path):
+        """Submit one parallel task, or hold it behind an identical in-flight file"""
+        cache_key = task[-1]
+        cache_entry = cached_output_entry(output_cache, cache_key, output_dir)
+        owns_key = cache_key is not None and cache_entry is None
+        if owns_key:
+            if cache_key in inflight_keys:
+                waiting_on_key[cache_key].append((task, file_path, relative_path, folder_path))
+                return
+            inflight_keys.add(cache_key)
+        future = executor.submit(process_file_parallel_wrapper, task + (cache_entry,))
+        pending[future] = (file_path, relative_path, folder_path, cache_key if owns_key else None)
+    if args.jobs > 1:
+        # Fork where it is safe (Linux) so workers inherit the compiled
+        # pattern instead of each recompiling it; initargs aren't pickled
+        # under fork. Elsewhere the platform default (spawn) applies.
+        if sys.platform.startswith('linux'):
+            mp_context = multiprocessing.get_context('fork')
+            inherited_patterns = compiled_patterns
+        else:
+            mp_context = None
+            inherited_patterns = None
+        executor = ProcessPoolExecutor(
+            max_workers=args.jobs,
+            mp_context=mp_context,
+            initializer=_worker_init,
+            initargs=(alias_map, sorted_keys, pattern_source, log_file, inherited_patterns)
+        )
 
-        # Get folder info and prompt for image removal
-        folder_info = get_folder_info(folder_path, input_dir)
-        remove_images, auto_mode = prompt_for_image_removal(folder_info, auto_mode, folder_specific_removal)
+    def collect_results(done):
+        """Record finished parallel tasks (called on the main thread)"""
+        for future in done:
+            file_path, relative_path, folder_path, owned_key = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                # Worker process died (e.g. killed for memory)
+                logger.error(f"Failed to process {relative_path}: Worker crashed: {str(e)}")
+                result = {
+                    'status': 'failed',
+                    'replacements': 0,
+                    'images_removed': 0,
+                    'error': f"Worker crashed: {str(e)}",
+                    'processing_time': 0
+                }
+
+            # Log folder-specific overrides
+            if result.get('folder_specific_override') and folder_specific_removal:
+                logger.info(f"Folder-specific image removal rule applied for: {relative_path}")
+
+            record_file_result(stats, file_path, relative_path, result, pdf_batcher,
+                               output_cache, output_dir, pdf_cache_keys, pdf_duplicates)
+            progress.update(str(relative_path), stats)
+
+            # Release duplicates of this file (they reuse its cached output)
+            if owned_key is not None:
+                inflight_keys.discard(owned_key)
+                for waiting in waiting_on_key.pop(owned_key, ()):
+                    submit_task(*waiting)
+
+            # Folder finished: start its partial PDF batches in the background
+            folder_outstanding[folder_path] -= 1
+            if folder_outstanding[folder_path] == 0 and pdf_batcher is not None:
+                pdf_batcher.flush(wait=False)
 
-        # Check if user chose to skip
-        if remove_images is None:
-            logger.info(f"Skipping folder: {folder_info['path']}")
-            for file_path in files:
-                relative_path = file_path.relative_to(input_dir)
-                stats.add_file_result(file_path, relative_path, 'skipped',
-                                    error_msg="User skipped folder")
-            continue
+    try:
+        for folder_path in sorted(folder_files.keys()):
+            files = folder_files[folder_path]
+
+            # Get folder info and prompt for image removal
+            progress.end_line()
+            folder_info = get_folder_info(folder_path, input_dir, folder_classification[folder_path])
+            remove_images, auto_mode = prompt_for_image_removal(folder_info, auto_mode, folder_specific_removal)
+
+            # Check if user chose to skip
+            if remove_images is None:
+                logger.info(f"Skipping folder: {folder_info['path']}")
+                for file_path in files:
+                    relative_path = file_path.relative_to(input_dir)
+                    stats.add_file_result(file_path, relative_path, 'skipped',
+                                        error_msg="User skipped folder")
+                continue
+
+            # Parallel mode submits the folder's files largest first
+            if executor is not None:
+                files = largest_first(files)
+
+            # Convert the folder's legacy .doc/.ppt files up front in batches;
+            # ones LibreOffice can't convert are copied as-is later. Keys come
+            # from the original inputs, so files whose output is cached, or
+            # that wait on an identical file submitted earlier, reuse that
+            # output and need no conversion. (Only folders with legacy files
+            # wait for their hashes here.)
+            to_convert = []
+            if any(f.suffix.lower() in LEGACY_FORMATS for f in files):
+                claimed_keys = set(inflight_keys)
+                for file_path in files:
+                    cache_key = file_cache_key(file_path, remove_images)
+                    if cache_key is not None:
+                        if cache_key in claimed_keys or cached_output_entry(output_cache, cache_key, output_dir):
+                            continue
+                        claimed_keys.add(cache_key)
+                    to_convert.append(file_path)
+            legacy_conversions = convert_legacy_formats(to_convert, input_dir, output_dir, logger)
+            for file_path, converted in legacy_conversions.items():
+                if converted is None:
+                    relative_path = file_path.relative_to(input_dir)
+                    record_file_result(stats, file_path, relative_path,
+                                       legacy_conversion_failed_result(file_path), pdf_batcher)
+                    progress.update(str(relative_path), stats)
+            files = [f for f in files
+                     if f not in legacy_conversions or legacy_conversions[f] is not None]
+
+            if executor is not None:
+                # PARALLEL MODE: feed this folder's files to the pool, keeping
+                # the in-flight queue bounded and recording results as they
+                # finish; the tail of the folder overlaps the next prompt
+                folder_outstanding[folder_path] = len(files)
+                for file_path in files:
+                    while len(pending) >= args.jobs * MAX_PENDING_PER_WORKER:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        collect_results(done)
+
+                    relative_path = file_path.relative_to(input_dir)
+                    task_args = (
+                        str(file_path),
+                        str(input_dir),
+                        str(output_dir),
+                        str(pdf_output_dir),
+                        remove_images,  # Folder default
+                        args.remove_hyperlinks,
+                        timestamp_suffix,
+                        folder_specific_removal,
+                        str(relative_path),
+                        str(legacy_conversions[file_path]) if file_path in legacy_conversions else None,
+                        file_cache_key(file_path, remove_images)
+                    )
+                    submit_task(task_args, file_path, relative_path, folder_path)
+                continue
 
-        # Process all files in this folder (sequential or parallel)
-        if args.parallel_workers == 1:
             # SEQUENTIAL MODE: Process files one at a time
             for file_path in files:
                 relative_path = file_path.relative_to(input_dir)
@@ -1469,96 +2220,57 @@ Examples:
                 if file_remove_images != remove_images and folder_specific_removal:
                     logger.info(f"Folder-specific image removal rule applied for: {relative_path}")
 
-                # Process file
+                # Process file (files without a key can't have been processed before)
+                cache_key = file_cache_key(file_path, remove_images)
                 result = process_file(
                     file_path, input_dir, output_dir, pdf_output_dir,
                     alias_map, sorted_keys, compiled_patterns,
                     logger, remove_images=file_remove_images,
                     remove_hyperlinks=args.remove_hyperlinks,
-                    generate_pdf=not args.no_pdf,
-                    timestamp_suffix=timestamp_suffix
-                )
-
-                # Update stats
-                stats.add_file_result(
-                    file_path, relative_path, result['status'],
-                    result['replacements'], result['images_removed'],
-                    result.get('hyperlinks_removed', 0),
-                    result['processing_time'], result.get('error', ''),
-                    replacement_details=result.get('replacement_details', {})
+                    timestamp_suffix=timestamp_suffix,
+                    converted_path=legacy_conversions.get(file_path),
+                    output_cache=output_cache if cache_key is not None else None,
+                    cache_salt=cache_salt,
+                    cache_key=cache_key,
+                    relative_path=relative_path
                 )
 
-                # Track PDF conversion
-                if not args.no_pdf and 'pdf_success' in result:
-                    stats.add_pdf_result(result['pdf_success'])
+                record_file_result(stats, file_path, relative_path, result, pdf_batcher,
+                                   output_cache, output_dir, pdf_cache_keys, pdf_duplicates)
 
                 # Update progress display
                 progress.update(str(relative_path), stats)
 
-        else:
-            # PARALLEL MODE: Process files in parallel using Pool
-            print(f"{Colors.BOLD}Processing folder:{Colors.ENDC} {folder_info['path']} ({len(files)} files)")
-
-            # Build task list for parallel processing
-            tasks = []
-            for file_path in files:
-                relative_path = file_path.relative_to(input_dir)
-
-                # Prepare arguments tuple for worker (convert Paths to strings for pickling)
-                task_args = (
-                    str(file_path),
-                    str(input_dir),
-                    str(output_dir),
-                    str(pdf_output_dir),
-                    alias_map,
-                    sorted_keys,
-                    compiled_patterns,
-                    remove_images,  # Folder default
-                    args.remove_hyperlinks,
-                    not args.no_pdf,
-                    timestamp_suffix,
-                    folder_specific_removal,
-                    str(relative_path)
-                )
-                tasks.append(task_args)
-
-            # Process files in parallel
-            folder_start = time.time()
-            with Pool(processes=args.parallel_workers) as pool:
-                results = pool.map(process_file_parallel_wrapper, tasks)
-
-            folder_time = time.time() - folder_start
-
-            # Collect results and update stats
-            for result in results:
-                file_path = Path(result['file_path'])
-                relative_path = Path(result['relative_path'])
-
-                # Log folder-specific overrides
-                if result.get('folder_specific_override') and folder_specific_removal:
-                    logger.info(f"Folder-specific image removal rule applied for: {relative_path}")
-
-                # Update stats
-                stats.add_file_result(
-                    file_path, relative_path, result['status'],
-                    result['replacements'], result['images_removed'],
-                    result.get('hyperlinks_removed', 0),
-                    result['processing_time'], result.get('error', ''),
-                    replacement_details=result.get('replacement_details', {})
-                )
-
-                # Track PDF conversion
-                if not args.no_pdf and 'pdf_success' in result:
-                    stats.add_pdf_result(result['pdf_success'])
-
-            # Show folder batch summary
-            print(f"{Colors.GREEN}✓ Completed {len(files)} files in {folder_time:.1f}s "
-                  f"({stats.files_succeeded} succeeded, {stats.files_failed} failed){Colors.ENDC}")
+            # Start converting this folder's partial PDF batches in the background
+            if pdf_batcher is not None:
+                pdf_batcher.flush(wait=False)
+
+        # Collect the remaining parallel results
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect_results(done)
+
+        # Wait for PDF batches still converting
+        progress.end_line()
+        if pdf_batcher is not None and (pdf_batcher.pending or pdf_batcher.running):
+            print(f"\n{Colors.BOLD}Waiting for remaining PDF conversions...{Colors.ENDC}")
+            pdf_batcher.flush()
+
+    finally:
+        hash_executor.shutdown(cancel_futures=True)
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if pdf_executor is not None:
+            pdf_executor.shutdown(cancel_futures=True)
+        if not args.no_cache:
+            save_output_cache(output_dir, output_cache, logger)
 
     # Copy non-processable files and preserve empty folders
     print(f"\n{Colors.BOLD}Finalizing folder structure...{Colors.ENDC}")
-    files_copied = copy_non_processable_files(input_dir, output_dir, timestamp_suffix, logger, stats)
-    preserve_empty_folders(input_dir, output_dir, timestamp_suffix, logger)
+    files_copied = copy_non_processable_files(input_dir, output_dir, timestamp_suffix, logger, stats,
+                                              files_by_ext=input_files_by_ext)
+    preserve_empty_folders(input_dir, output_dir, timestamp_suffix, logger,
+                           directories=input_directories)
     print(f"{Colors.GREEN}✓ Copied {files_copied} non-processable files and preserved folder structure{Colors.ENDC}")
 
     # Print final summary
@@ -1567,8 +2279,7 @@ Examples:
     # Generate Excel report
     report_dir = Path(__file__).parent / 'reports'
     report_dir.mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    report_path = report_dir / f"batch_report_{timestamp}.xlsx"
+    report_path = report_dir / f"batch_report_{run_timestamp}.xlsx"
 
     print(f"\n{Colors.BOLD}Generating comprehensive report...{Colors.ENDC}")
     generate_excel_report(stats, report_path, alias_map, logger)
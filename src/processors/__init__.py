@@ -6,7 +6,9 @@ from .docx_processor import (
     process_single_docx,
     load_aliases_from_excel,
     categorize_and_sort_aliases,
-    precompile_patterns
+    precompile_patterns,
+    build_pattern_source,
+    compile_pattern_source
 )
 from .excel_processor import process_single_xlsx, process_single_xls
 from .pptx_processor import process_single_pptx
@@ -16,6 +18,8 @@ __all__ = [
     'load_aliases_from_excel',
     'categorize_and_sort_aliases',
     'precompile_patterns',
+    'build_pattern_source',
+    'compile_pattern_source',
     'process_single_xlsx',
     'process_single_xls',
     'process_single_pptx'
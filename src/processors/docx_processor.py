@@ -37,6 +37,7 @@ from multiprocessing import Pool, cpu_count
 from openpyxl import load_workbook
 from docx import Document
 from src.utils.anonymizer_utils import anonymize_text as anonymize_text_shared, merge_details as merge_details_shared
+from src.utils.anonymizer_utils import build_alias_prefilter, alias_free_result
 
 
 def strip_all_metadata(doc):
@@ -200,13 +201,33 @@ def load_aliases_from_excel(excel_path):
     """
     Load anonymization mappings from Excel file.
     Reuses exact logic from vdr_anonymizer_final.py
+
+    PERFORMANCE: Opens the workbook read-only and iterates plain values,
+    keeping memory O(row) instead of materializing every cell object.
     """
     # SECURITY: Validate Excel file can be loaded
     try:
-        wb = load_workbook(excel_path, data_only=True)
+        wb = load_workbook(excel_path, read_only=True, data_only=True)
     except Exception as e:
         raise ValueError(f"Invalid or corrupted Excel file: {e}")
 
+    try:
+        rows = _read_alias_rows(wb)
+    finally:
+        # Read-only workbooks keep the file handle open until closed
+        wb.close()
+
+    return _build_alias_map(*rows)
+
+
+def _read_alias_rows(wb):
+    """
+    Locate the mapping sheet, header row and columns in a read-only workbook.
+
+    Returns:
+        Tuple of (value_rows, original_col, replacement_col) where value_rows
+        is a list of row value tuples below the header
+    """
     # Find the correct sheet (flexible detection)
     sheet = None
     for sheet_name in wb.sheetnames:
@@ -219,11 +240,13 @@ def load_aliases_from_excel(excel_path):
 
     # Find columns
     header_row = None
-    for row in sheet.iter_rows(max_row=10):
-        cell_values = [str(cell.value).lower() if cell.value else '' for cell in row]
+    header_row_number = None
+    for row_number, row in enumerate(sheet.iter_rows(max_row=10, values_only=True), start=1):
+        cell_values = [str(value).lower() if value else '' for value in row]
         # Support both "Before/After" and "Original/Replacement" formats
         if any('original' in val or 'real' in val or 'actual' in val or 'before' in val for val in cell_values):
             header_row = row
+            header_row_number = row_number
             break
 
     if not header_row:
@@ -233,8 +256,8 @@ def load_aliases_from_excel(excel_path):
     original_col = None
     replacement_col = None
 
-    for idx, cell in enumerate(header_row):
-        val = str(cell.value).lower() if cell.value else ''
+    for idx, value in enumerate(header_row):
+        val = str(value).lower() if value else ''
         # Support both "Before" and "Original" for source column
         if 'original' in val or 'real' in val or 'actual' in val or 'before' in val:
             original_col = idx
@@ -245,11 +268,18 @@ def load_aliases_from_excel(excel_path):
     if original_col is None or replacement_col is None:
         raise ValueError("Could not identify original and replacement columns")
 
+    value_rows = list(sheet.iter_rows(min_row=header_row_number + 1, values_only=True))
+    return value_rows, original_col, replacement_col
+
+
+def _build_alias_map(value_rows, original_col, replacement_col):
+    """Build the alias map (plus reverse-name and suffix variants) from row values."""
     # Load mappings
     alias_map = {}
-    for row in sheet.iter_rows(min_row=header_row[0].row + 1):
-        original = row[original_col].value
-        replacement = row[replacement_col].value
+    for row in value_rows:
+        # Read-only rows stop at the last non-empty cell, so pad short rows
+        original = row[original_col] if original_col < len(row) else None
+        replacement = row[replacement_col] if replacement_col < len(row) else None
 
         # CRITICAL: Allow blank "After" values for deletion/removal
         # If After is blank, we replace with empty string (removes the text)
@@ -373,9 +403,9 @@ def categorize_and_sort_aliases(alias_map):
     return sorted_keys
 
 
-def precompile_patterns(alias_map):
+def build_pattern_source(alias_map):
     """
-    Pre-compile a SINGLE combined regex pattern for all replacements.
+    Build the SINGLE combined regex pattern string for all replacements.
 
     PERFORMANCE OPTIMIZATION v2.1: Instead of 367 separate regex passes,
     we combine all patterns into ONE: (pattern1|pattern2|...|pattern367)
@@ -389,13 +419,19 @@ def precompile_patterns(alias_map):
     BUG FIX v1.6: Smart word boundaries that handle special characters correctly
     - Normal words: Use \b word boundaries
     - Numbers/special chars: Use lookaround assertions instead
+
+    Returns plain data (no compiled regex), so it is cheap to pickle to
+    worker processes; compile it there with compile_pattern_source.
+
+    Returns:
+        Dict with 'pattern' (string or None), 'lookup' and 'sorted_keys'
     """
     import re
 
     # Handle empty alias map (edge case)
     if not alias_map:
         return {
-            'combined': None,
+            'pattern': None,
             'lookup': {},
             'sorted_keys': []
         }
@@ -429,12 +465,11 @@ def precompile_patterns(alias_map):
 
         return left_boundary + escaped + right_boundary
 
-    # Build combined pattern with smart boundaries
+    # Build combined pattern with smart boundaries. The group is
+    # non-capturing: replacements only use match.group(0), and per-alias
+    # named groups (dispatch on match.lastgroup) measured ~10x slower in re
     escaped_patterns = [smart_boundary(original) for original in sorted_originals]
-    combined_pattern = '(' + '|'.join(escaped_patterns) + ')'
-
-    # Compile combined pattern (case-insensitive)
-    compiled = re.compile(combined_pattern, re.IGNORECASE)
+    combined_pattern = '(?:' + '|'.join(escaped_patterns) + ')'
 
     # Create reverse lookup map: lowercase original → (actual original, replacement)
     # This allows us to find the right replacement when a match is found
@@ -443,12 +478,43 @@ def precompile_patterns(alias_map):
         lookup[original.lower()] = (original, replacement)
 
     return {
-        'combined': compiled,
+        'pattern': combined_pattern,
         'lookup': lookup,
         'sorted_keys': sorted_originals  # For backward compatibility
     }
 
 
+def compile_pattern_source(pattern_source, prefilter=True):
+    """
+    Compile a build_pattern_source result into the compiled_patterns dict
+    used by anonymize_text (combined pattern is case-insensitive). When
+    pyahocorasick is installed, 'prefilter' holds an automaton over the alias
+    keys that lets anonymize_text skip text containing none of them; pass
+    prefilter=False for patterns used on a single text, where building it
+    costs more than the regex pass it could save.
+    """
+    import re
+
+    pattern = pattern_source['pattern']
+    return {
+        'combined': re.compile(pattern, re.IGNORECASE) if pattern else None,
+        'lookup': pattern_source['lookup'],
+        'sorted_keys': pattern_source['sorted_keys'],
+        'prefilter': build_alias_prefilter(pattern_source['sorted_keys']) if prefilter else None
+    }
+
+
+def precompile_patterns(alias_map, prefilter=True):
+    """
+    Pre-compile a SINGLE combined regex pattern for all replacements
+    (see build_pattern_source and compile_pattern_source).
+
+    Returns:
+        Dict with 'combined' compiled pattern, 'lookup' map and 'sorted_keys'
+    """
+    return compile_pattern_source(build_pattern_source(alias_map), prefilter=prefilter)
+
+
 def anonymize_text(text, alias_map, sorted_keys, compiled_patterns=None, track_details=False):
     """
     Apply anonymization replacements with case matching using SINGLE-PASS regex (v2.1).
@@ -466,7 +532,7 @@ def anonymize_text(text, alias_map, sorted_keys, compiled_patterns=None, track_d
 
     # If patterns not pre-compiled, compile them now (fallback for backward compatibility)
     if compiled_patterns is None:
-        compiled_patterns = precompile_patterns(alias_map)
+        compiled_patterns = precompile_patterns(alias_map, prefilter=False)
 
     # Extract combined pattern and lookup map
     combined_pattern = compiled_patterns.get('combined')
@@ -480,6 +546,11 @@ def anonymize_text(text, alias_map, sorted_keys, compiled_patterns=None, track_d
             return result[0], result[1], {}  # Return empty details for legacy
         return result
 
+    # Most paragraphs hold no alias at all: skip the regex pass for them
+    skipped = alias_free_result(text, compiled_patterns, track_details)
+    if skipped is not None:
+        return skipped
+
     # Track which originals were replaced (v2.1 feature)
     details = {} if track_details else None
 
@@ -726,7 +797,7 @@ def anonymize_paragraph(paragraph, alias_map, sorted_keys, compiled_patterns=Non
     return count
 
 
-def anonymize_docx(docx_path, alias_map, sorted_keys, track_details=False):
+def anonymize_docx(docx_path, alias_map, sorted_keys, track_details=False, compiled_patterns=None):
     """
     Anonymize all text in DOCX file (paragraphs, headers, footers, tables).
     FIXED: Now handles text that spans multiple runs.
@@ -750,8 +821,10 @@ def anonymize_docx(docx_path, alias_map, sorted_keys, track_details=False):
     total_replacements = 0
     document_details = {} if track_details else None
 
-    # PERFORMANCE: Pre-compile all regex patterns ONCE (not millions of times)
-    compiled_patterns = precompile_patterns(alias_map)
+    # PERFORMANCE: Pre-compile all regex patterns ONCE (not millions of times);
+    # batch callers compile once per process and pass them in
+    if compiled_patterns is None:
+        compiled_patterns = precompile_patterns(alias_map)
 
     # Create tracking wrapper for anonymize_text calls
     def anonymize_with_tracking(text, alias_map, sorted_keys, compiled_patterns):
@@ -926,7 +999,7 @@ def anonymize_docx(docx_path, alias_map, sorted_keys, track_details=False):
     return doc, total_replacements
 
 
-def process_single_docx(input_path, output_path, alias_map, sorted_keys, logger, remove_images=True, clear_headers_footers_flag=False, track_details=False, remove_hyperlinks=False):
+def process_single_docx(input_path, output_path, alias_map, sorted_keys, logger, remove_images=True, clear_headers_footers_flag=False, track_details=False, remove_hyperlinks=False, compiled_patterns=None):
     """
     Process a single DOCX file: anonymize + strip metadata + optional image removal + optional header/footer clearing + optional hyperlink removal.
 
@@ -937,6 +1010,7 @@ def process_single_docx(input_path, output_path, alias_map, sorted_keys, logger,
         clear_headers_footers_flag: If True, clears all header/footer content (for presentations with logos)
         track_details: If True, return detailed replacement tracking (v2.1)
         remove_hyperlinks: If True, removes hyperlink metadata after anonymization (preserves text)
+        compiled_patterns: Optional precompile_patterns result (compiled per file if omitted)
 
     Returns:
         If track_details=False: (replacements, images_removed, hyperlinks_removed)
@@ -951,9 +1025,11 @@ def process_single_docx(input_path, output_path, alias_map, sorted_keys, logger,
     try:
         # Load DOCX with optional tracking
         if track_details:
-            doc, replacements, details = anonymize_docx(input_path, alias_map, sorted_keys, track_details=True)
+            doc, replacements, details = anonymize_docx(input_path, alias_map, sorted_keys, track_details=True,
+                                                        compiled_patterns=compiled_patterns)
         else:
-            doc, replacements = anonymize_docx(input_path, alias_map, sorted_keys)
+            doc, replacements = anonymize_docx(input_path, alias_map, sorted_keys,
+                                               compiled_patterns=compiled_patterns)
 
         # Remove hyperlink metadata (AFTER anonymization, before image removal)
         hyperlinks_removed = 0
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Upload Processing Worker
+Per-file anonymization and chunked PDF conversion for the Streamlit app's
+process pool
+"""
+
+import logging
+import os
+from pathlib import Path
+
+from src.processors.docx_processor import process_single_docx
+from src.processors.pptx_processor import process_single_pptx
+from src.processors.excel_processor import process_single_xlsx
+from src.utils.libreoffice_utils import convert_batch, worker_profile_dir
+
+# soffice timeout budget per file in a batched conversion
+PDF_TIMEOUT_PER_FILE = 300
+
+
+def process_uploaded_file_worker(args):
+    """
+    Worker function for the Streamlit ProcessPoolExecutor (anonymization only;
+    PDFs are converted afterwards in chunks). Must live in an importable module
+    so it can be pickled by reference; creates its own logger to avoid
+    pickling issues.
+
+    Args:
+        args: Tuple of (index, original_name, input_path, file_type,
+              original_output_path, alias_map, sorted_keys, compiled_patterns,
+              options) where options is a dict with
+              remove_images, remove_hyperlinks and clear_headers_footers
+
+    Returns:
+        Dict with index, result row, log entry, replacement details, counts
+        and the output path (only on success)
+    """
+    (index, original_name, input_path, file_type, original_output_path,
+     alias_map, sorted_keys, compiled_patterns, options) = args
+
+    logger = logging.getLogger(f"upload_worker_{os.getpid()}")
+
+    log_entry = {
+        'filename': original_name,
+        'file_type': file_type,
+        'status': 'processing',
+        'details': []
+    }
+    result = {
+        'filename': original_name,
+        'file_type': file_type.capitalize(),
+        'replacements': 0,
+        'images': 0,
+        'hyperlinks': 0,
+        'pdf_status': f'✗ {file_type.capitalize()} Error',
+        'pdf_size_kb': 0
+    }
+    replacement_details = []
+
+    try:
+        # Route to appropriate processor based on file type (with detailed tracking)
+        if file_type == 'word':
+            replacements, images, hyperlinks, details = process_single_docx(
+                input_path, original_output_path, alias_map, sorted_keys, logger,
+                remove_images=options['remove_images'],
+                remove_hyperlinks=options['remove_hyperlinks'],
+                clear_headers_footers_flag=options['clear_headers_footers'],
+                track_details=True, compiled_patterns=compiled_patterns
+            )
+            log_parts = [f"Word: {replacements} replacements", f"{images} images removed"]
+        elif file_type == 'powerpoint':
+            replacements, images, hyperlinks, details = process_single_pptx(
+                input_path, original_output_path, alias_map, sorted_keys,
+                compiled_patterns, logger, remove_images=options['remove_images'],
+                remove_hyperlinks=options['remove_hyperlinks'],
+                track_details=True
+            )
+            log_parts = [f"PowerPoint: {replacements} replacements", f"{images} images removed"]
+        elif file_type == 'excel':
+            replacements, images, hyperlinks, details = process_single_xlsx(
+                input_path, original_output_path, alias_map, sorted_keys,
+                compiled_patterns, logger, remove_images=False,
+                remove_hyperlinks=options['remove_hyperlinks'],
+                track_details=True
+            )
+            log_parts = [f"Excel: {replacements} replacements"]
+        else:
+            raise ValueError(f"Unsupported file type: {file_type}")
+
+        if options['remove_hyperlinks']:
+            log_parts.append(f"{hyperlinks} hyperlinks removed")
+        log_entry['details'].append(", ".join(log_parts))
+
+        # Store replacement details for this file
+        if details:
+            for original, count in details.items():
+                replacement_details.append({
+                    'File': original_name,
+                    'Original': original,
+                    'Replacement': alias_map.get(original, alias_map.get(original.lower(), '?')),
+                    'Count': count
+                })
+
+        # CRITICAL: Verify output file was actually created (prevents silent failures)
+        if not original_output_path.exists():
+            raise FileNotFoundError(f"Output file not created - processing failed silently")
+
+        # Check for 0-byte files (indicates incomplete processing)
+        if original_output_path.stat().st_size == 0:
+            raise ValueError(f"Output file is empty (0 bytes) - processing incomplete")
+
+    except Exception as e:
+        log_entry['details'].append(f"Processing Error: {str(e)[:100]}")
+        log_entry['status'] = 'error'
+        return {
+            'index': index,
+            'result': result,
+            'log_entry': log_entry,
+            'replacement_details': [],
+            'replacements': 0,
+            'images': 0,
+            'hyperlinks': 0
+        }
+
+    result.update(replacements=replacements, images=images, hyperlinks=hyperlinks,
+                  pdf_status='⏳ Pending')
+    return {
+        'index': index,
+        'result': result,
+        'log_entry': log_entry,
+        'replacement_details': replacement_details,
+        'replacements': replacements,
+        'images': images,
+        'hyperlinks': hyperlinks,
+        'output_path': original_output_path
+    }
+
+
+def convert_pdf_chunk_worker(args):
+    """
+    Worker function converting a chunk of anonymized files to PDF with one
+    soffice invocation. Each worker uses its own profile so parallel soffice
+    runs don't collide.
+
+    Args:
+        args: Tuple of (chunk, pdf_output_dir) where chunk is a list of
+              (index, output_path, pdf_output_path) tuples
+
+    Returns:
+        List of (index, pdf_status, pdf_size_kb, log_detail, log_status) tuples
+    """
+    chunk, pdf_output_dir = args
+    pdf_output_dir = Path(pdf_output_dir)
+
+    try:
+        outputs, timed_out = convert_batch(
+            [output_path for _, output_path, _ in chunk], 'pdf', pdf_output_dir,
+            timeout=PDF_TIMEOUT_PER_FILE * len(chunk),
+            profile_dir=worker_profile_dir()
+        )
+    except Exception as e:
+        return [(index, '✗ Error', 0, f"PDF: Error - {str(e)[:100]}", 'warning')
+                for index, _, _ in chunk]
+
+    statuses = []
+    for index, output_path, pdf_output_path in chunk:
+        expected_output = outputs[Path(output_path)]
+        if expected_output is None:
+            if Path(output_path) in timed_out:
+                statuses.append((index, '⚠ Timeout', 0, "PDF: Timeout (5min/file exceeded)", 'warning'))
+            else:
+                statuses.append((index, '✗ Failed', 0, "PDF: Conversion failed", 'warning'))
+            continue
+
+        if expected_output != pdf_output_path:
+            os.replace(expected_output, pdf_output_path)
+
+        size_kb = pdf_output_path.stat().st_size / 1024
+        statuses.append((index, '✓ Success', round(size_kb), f"PDF: Success ({size_kb:.0f} KB)", 'success'))
+    return statuses
@@ -5,14 +5,19 @@ Professional document anonymization tool for financial data rooms
 """
 import streamlit as st
 import sys
-import os
+import io
+import contextlib
+import hashlib
 from pathlib import Path
 import tempfile
 import shutil
 import subprocess
-import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 import traceback
+import uuid
 
 # Page configuration MUST come first, before any other Streamlit commands
 st.set_page_config(
@@ -28,18 +33,83 @@ try:
     from src.processors.docx_processor import (
         load_aliases_from_excel,
         categorize_and_sort_aliases,
-        process_single_docx,
         precompile_patterns
     )
-    from src.processors.pptx_processor import process_single_pptx
-    from src.processors.excel_processor import process_single_xlsx
-    import logging
+    from src.processors.upload_worker import (
+        process_uploaded_file_worker,
+        convert_pdf_chunk_worker
+    )
+    from src.utils.archive_utils import (
+        zip_directory,
+        directory_size,
+        link_or_copy,
+        COPY_BUFFER_SIZE
+    )
+    from src.utils.libreoffice_utils import convert_batch, init_worker_profile, thread_profile_dir
+    from src.utils.cpu_utils import available_cpu_count
 
 except Exception as e:
     st.error(f"❌ **Import Error**: {e}")
     st.code(traceback.format_exc())
     st.stop()
 
+# Max files per soffice invocation when converting to PDF
+PDF_BATCH_SIZE = 20
+
+# soffice timeout budget per file when converting legacy formats
+LEGACY_TIMEOUT_PER_FILE = 120
+
+# Legacy extension -> (converted extension, file type)
+LEGACY_FORMATS = {
+    '.doc': ('.docx', 'word'),
+    '.ppt': ('.pptx', 'powerpoint'),
+    '.xls': ('.xlsx', 'excel'),
+}
+LEGACY_TARGET_TYPES = {target_ext: file_type for target_ext, file_type in LEGACY_FORMATS.values()}
+
+# Local file header signature: OOXML files are ZIP packages
+ZIP_MAGIC = b'PK\x03\x04'
+
+# Download ZIPs smaller than this are built in memory; larger ones on disk
+IN_MEMORY_ZIP_LIMIT = 256 * 1024 * 1024
+
+# Uploads whose outputs are kept for reuse per session (oldest evicted first)
+PROCESSED_CACHE_LIMIT = 100
+
+# Session directories untouched for this long belong to ended sessions
+STALE_SESSION_SECONDS = 24 * 60 * 60
+
+# Worker processes: anonymization and PDF conversion run at the same time
+# (each PDF worker also drives its own soffice), so the two pools split the
+# CPUs instead of each claiming all of them
+ANON_WORKERS = max(1, (available_cpu_count() + 1) // 2)
+PDF_WORKERS = max(1, available_cpu_count() - ANON_WORKERS)
+
+# Pool workers come from a fork server rather than being forked from the
+# multithreaded Streamlit server (the worker functions live in importable
+# modules, as forkserver and spawn require)
+POOL_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
+
+@st.cache_resource
+def get_worker_pool():
+    """Anonymization process pool shared across reruns and sessions."""
+    return ProcessPoolExecutor(max_workers=ANON_WORKERS, mp_context=POOL_CONTEXT)
+
+
+@st.cache_resource
+def get_pdf_pool():
+    """
+    PDF conversion process pool, separate from anonymization so the two
+    stages overlap. Keeping the workers alive keeps each worker's resident
+    LibreOffice server (see src.utils.libreoffice_utils) warm between batches.
+    """
+    return ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=POOL_CONTEXT,
+                               initializer=init_worker_profile)
+
+
 # Custom CSS - xAI Soft Aesthetic
 st.markdown("""
 <style>
@@ -298,8 +368,14 @@ for key, default in [
     ('total_files', 0),
     ('total_replacements', 0),
     ('total_images', 0),
-    ('originals_zip_data', None),
+    ('originals_zip_data', None),  # Small ZIPs are kept in memory...
     ('pdf_zip_data', None),
+    ('originals_zip_path', None),  # ...large ones live on disk
+    ('pdf_zip_path', None),
+    ('session_dir', None),
+    ('pdf_success_count', 0),  # Aggregates computed once per batch
+    ('replacement_summary', None),
+    ('processed_cache', {}),  # upload hash -> outputs of an earlier identical upload
     ('timestamp', None),
     ('processing_logs', []),  # Store detailed logs
     ('upload_key', 0)  # For clearing file uploads on "New Batch"
@@ -307,6 +383,186 @@ for key, default in [
     if key not in st.session_state:
         st.session_state[key] = default
 
+
+
+@st.cache_data(show_spinner=False)
+def load_alias_mappings(excel_bytes):
+    """
+    Parse the mapping workbook, cached on its bytes so reruns with an
+    unchanged Excel file skip openpyxl entirely.
+
+    Returns:
+        Tuple of (alias_map, sorted_keys)
+    """
+    alias_map = load_aliases_from_excel(io.BytesIO(excel_bytes))
+    return alias_map, categorize_and_sort_aliases(alias_map)
+
+
+def store_processed_outputs(upload_key, output_path, pdf_path, result, log_entry, replacement_details):
+    """
+    Hard-link (or copy) an anonymized upload's outputs into the session cache
+    so identical uploads can reuse them. pdf_path is None when its PDF
+    conversion failed; reuses then carry the cached failed PDF status.
+
+    Returns:
+        Cache entry dict for st.session_state.processed_cache
+    """
+    cache_dir = get_session_dir() / 'cache' / b''.join(upload_key).hex()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    cached_output = cache_dir / output_path.name
+    link_or_copy(output_path, cached_output)
+    cached_pdf = None
+    if pdf_path is not None and pdf_path.exists():
+        cached_pdf = cache_dir / pdf_path.name
+        link_or_copy(pdf_path, cached_pdf)
+
+    return {
+        'output_path': str(cached_output),
+        'pdf_path': str(cached_pdf) if cached_pdf else None,
+        'result': dict(result),
+        'log_entry': {**log_entry, 'details': list(log_entry['details'])},
+        'replacement_details': list(replacement_details)
+    }
+
+
+def prune_processed_cache():
+    """
+    Evict the least recently used entries (and their files) beyond
+    PROCESSED_CACHE_LIMIT from the session's processed-upload cache.
+    """
+    cache = st.session_state.processed_cache
+    while len(cache) > PROCESSED_CACHE_LIMIT:
+        evicted = cache.pop(next(iter(cache)))
+        shutil.rmtree(Path(evicted['output_path']).parent, ignore_errors=True)
+
+
+def reuse_processed_outputs(cached, safe_filename, originals_output_dir, pdf_output_dir):
+    """
+    Link cached outputs into this batch's output dirs under a new upload name.
+
+    Returns:
+        Tuple of (result row, log entry, replacement details) for the upload
+    """
+    stem = Path(safe_filename).stem
+    output_path = Path(cached['output_path'])
+    link_or_copy(output_path, originals_output_dir / (stem + output_path.suffix))
+    if cached['pdf_path'] and Path(cached['pdf_path']).exists():
+        link_or_copy(cached['pdf_path'], pdf_output_dir / f"{stem}.pdf")
+
+    result = {**cached['result'], 'filename': safe_filename}
+    log_entry = {
+        **cached['log_entry'],
+        'filename': safe_filename,
+        'details': cached['log_entry']['details'] + ["Reused output of an identical upload"]
+    }
+    details = [{**detail, 'File': safe_filename} for detail in cached['replacement_details']]
+    return result, log_entry, details
+
+
+@st.cache_data(show_spinner=False)
+def build_replacement_frame(details):
+    """
+    Build the sorted replacement-details table.
+
+    File and Original repeat heavily across rows, so they are stored as
+    categoricals: less memory, and groupby works on integer codes.
+
+    Args:
+        details: Tuple of (File, Original, Replacement, Count) tuples
+    """
+    import pandas as pd
+
+    df = pd.DataFrame.from_records(details, columns=['File', 'Original', 'Replacement', 'Count'])
+    df['File'] = df['File'].astype('category')
+    df['Original'] = df['Original'].astype('category')
+    df.sort_values(['File', 'Count'], ascending=[True, False], inplace=True)
+    return df
+
+
+def get_session_dir():
+    """
+    Return (creating on first use) this session's directory for download
+    ZIPs and cached outputs. Using it marks it as live; a new session also
+    sweeps away directories of sessions that ended without cleaning up.
+    """
+    if st.session_state.session_dir is None:
+        remove_stale_session_dirs()
+        st.session_state.session_dir = str(
+            Path(tempfile.gettempdir()) / f"docx_anon_{uuid.uuid4().hex}"
+        )
+    session_dir = Path(st.session_state.session_dir)
+    session_dir.mkdir(parents=True, exist_ok=True)
+    session_dir.touch()
+    return session_dir
+
+
+def remove_stale_session_dirs():
+    """Delete session directories unused for STALE_SESSION_SECONDS."""
+    cutoff = datetime.now().timestamp() - STALE_SESSION_SECONDS
+    for session_dir in Path(tempfile.gettempdir()).glob('docx_anon_*'):
+        try:
+            if session_dir.is_dir() and session_dir.stat().st_mtime < cutoff:
+                shutil.rmtree(session_dir, ignore_errors=True)
+        except OSError:
+            pass
+
+
+def remove_session_dir():
+    """Delete this session's directory: download ZIPs and cached outputs."""
+    remove_session_zips()
+    st.session_state.processed_cache = {}
+    if st.session_state.session_dir is not None:
+        shutil.rmtree(st.session_state.session_dir, ignore_errors=True)
+        st.session_state.session_dir = None
+
+
+def build_download_zip(kind, directory, suffix=None):
+    """
+    Archive an output directory for download.
+
+    Archives under IN_MEMORY_ZIP_LIMIT are built straight into a BytesIO
+    (no write-then-reread); larger ones are written to the session
+    directory outside the batch's TemporaryDirectory, and only their path
+    is kept so session state doesn't pin the bytes.
+
+    Args:
+        kind: 'originals' or 'pdf' (selects the session state keys)
+        directory: Directory whose files are archived
+        suffix: Optional lowercase extension filter (e.g. '.pdf')
+    """
+    if directory_size(directory, suffix) < IN_MEMORY_ZIP_LIMIT:
+        buffer = io.BytesIO()
+        zip_directory(buffer, directory, suffix)
+        st.session_state[f'{kind}_zip_data'] = buffer.getvalue()
+    else:
+        zip_path = get_session_dir() / f"anonymized_{kind}_{st.session_state.timestamp}.zip"
+        zip_directory(zip_path, directory, suffix)
+        st.session_state[f'{kind}_zip_path'] = str(zip_path)
+
+
+def open_download_zip(kind):
+    """
+    Return a context manager yielding the ZIP bytes or an open file handle,
+    or None if no archive is available.
+    """
+    if st.session_state[f'{kind}_zip_data']:
+        return contextlib.nullcontext(st.session_state[f'{kind}_zip_data'])
+    zip_path = st.session_state[f'{kind}_zip_path']
+    if zip_path and Path(zip_path).exists():
+        return open(zip_path, 'rb')
+    return None
+
+
+def remove_session_zips():
+    """Drop the previous batch's download ZIPs (in memory and on disk)."""
+    for kind in ('originals', 'pdf'):
+        st.session_state[f'{kind}_zip_data'] = None
+        if st.session_state[f'{kind}_zip_path']:
+            Path(st.session_state[f'{kind}_zip_path']).unlink(missing_ok=True)
+        st.session_state[f'{kind}_zip_path'] = None
+
+
 # xAI Logo and Header
 import base64
 
@@ -449,574 +705,573 @@ with col2:
     )
 st.markdown('</div>', unsafe_allow_html=True)
 
+# Processing and results render into placeholders so finishing a batch can
+# swap sections in place instead of re-running the whole script
+processing_placeholder = st.empty()
+results_placeholder = st.empty()
+
 if execute_btn:
-    # Reset state
-    st.session_state.processing_complete = False
-    st.session_state.results = []
-    st.session_state.originals_zip_data = None
-    st.session_state.pdf_zip_data = None
-
-    # Validate LibreOffice
-    with st.spinner("Validating PDF conversion engine..."):
-        try:
-            result = subprocess.run(['soffice', '--version'], capture_output=True, timeout=5)
-            if result.returncode != 0:
-                st.error("❌ LibreOffice not found")
-                st.info("Install: `sudo apt-get install libreoffice`")
+    with processing_placeholder.container():
+        # Reset state
+        st.session_state.processing_complete = False
+        st.session_state.results = []
+        remove_session_zips()
+
+        # Validate LibreOffice
+        with st.spinner("Validating PDF conversion engine..."):
+            try:
+                result = subprocess.run(['soffice', '--version'], stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL, timeout=5)
+                if result.returncode != 0:
+                    st.error("❌ LibreOffice not found")
+                    st.info("Install: `sudo apt-get install libreoffice`")
+                    st.stop()
+            except (FileNotFoundError, Exception) as e:
+                st.error(f"❌ PDF engine error: {e}")
                 st.stop()
-        except (FileNotFoundError, Exception) as e:
-            st.error(f"❌ PDF engine error: {e}")
-            st.stop()
 
-    # Validate files
-    if not docx_files or not excel_file:
-        st.error("❌ Missing required files")
-        st.stop()
-
-    # Processing pipeline
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-        input_dir = temp_path / "input"
-        originals_output_dir = temp_path / "originals_output"  # Preserves format
-        pdf_output_dir = temp_path / "pdf_output"
-
-        input_dir.mkdir()
-        originals_output_dir.mkdir()
-        pdf_output_dir.mkdir()
-
-        # Save Excel requirements
-        excel_path = temp_path / "requirements.xlsx"
-        with open(excel_path, 'wb') as f:
-            f.write(excel_file.getbuffer())
-
-        # Save input files and determine type
-        files_to_process = []
-        for uploaded_file in docx_files:
-            # SECURITY: Sanitize filename to prevent path traversal
-            from pathlib import Path
-            safe_filename = Path(uploaded_file.name).name  # Strips any directory components
-            file_path = input_dir / safe_filename
-            with open(file_path, 'wb') as f:
-                f.write(uploaded_file.getbuffer())
-
-            # Detect file type by extension
-            file_ext = file_path.suffix.lower()
-
-            # Convert legacy formats to modern ones
-            if file_ext == '.doc':
-                # Convert .doc to .docx
-                with st.spinner(f"Converting {safe_filename} to DOCX..."):
-                    try:
-                        cmd = [
-                            'soffice', '--headless', '--norestore', '--nologo',
-                            '--nofirststartwizard', '--convert-to', 'docx',
-                            '--outdir', str(input_dir), str(file_path)
-                        ]
-                        subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-                        converted_path = file_path.with_suffix('.docx')
-                        if converted_path.exists():
-                            files_to_process.append((safe_filename, converted_path, 'word', '.docx'))
-                        else:
-                            st.error(f"Conversion failed: {safe_filename}")
-                    except Exception as e:
-                        st.error(f"Conversion error: {e}")
-
-            elif file_ext == '.ppt':
-                # Convert .ppt to .pptx
-                with st.spinner(f"Converting {safe_filename} to PPTX..."):
-                    try:
-                        cmd = [
-                            'soffice', '--headless', '--norestore', '--nologo',
-                            '--nofirststartwizard', '--convert-to', 'pptx',
-                            '--outdir', str(input_dir), str(file_path)
-                        ]
-                        subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-                        converted_path = file_path.with_suffix('.pptx')
-                        if converted_path.exists():
-                            files_to_process.append((safe_filename, converted_path, 'powerpoint', '.pptx'))
-                        else:
-                            st.error(f"Conversion failed: {safe_filename}")
-                    except Exception as e:
-                        st.error(f"Conversion error: {e}")
+        # Validate files
+        if not docx_files or not excel_file:
+            st.error("❌ Missing required files")
+            st.stop()
 
-            elif file_ext == '.xls':
-                # Convert .xls to .xlsx (LibreOffice can do this)
-                with st.spinner(f"Converting {safe_filename} to XLSX..."):
+        # Processing pipeline
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            input_dir = temp_path / "input"
+            originals_output_dir = temp_path / "originals_output"  # Preserves format
+            pdf_output_dir = temp_path / "pdf_output"
+
+            input_dir.mkdir()
+            originals_output_dir.mkdir()
+            pdf_output_dir.mkdir()
+
+            options = {
+                'remove_images': remove_images,
+                'remove_hyperlinks': remove_hyperlinks,
+                'clear_headers_footers': clear_headers_footers
+            }
+            # Outputs depend on the mapping file and options as well as the upload
+            config_hash = hashlib.blake2b(digest_size=16)
+            config_hash.update(excel_file.getbuffer())
+            config_hash.update(repr(sorted(options.items())).encode())
+            config_digest = config_hash.digest()
+
+            # Save input files and determine type
+            files_to_process = []
+            upload_keys = []  # parallel to files_to_process
+            reused_uploads = []  # (safe_filename, upload_key) served from earlier outputs
+            batch_keys = set()
+            legacy_files = {}  # target format -> [(position, safe_filename, file_path)]
+            for uploaded_file in docx_files:
+                # SECURITY: Sanitize filename to prevent path traversal
+                safe_filename = Path(uploaded_file.name).name  # Strips any directory components
+                file_path = input_dir / safe_filename
+
+                # Identical bytes seen earlier (this session or this batch) are not reprocessed
+                upload_key = (
+                    hashlib.blake2b(uploaded_file.getbuffer(), digest_size=16).digest(),
+                    config_digest
+                )
+                cached = st.session_state.processed_cache.get(upload_key)
+                if upload_key in batch_keys or (cached and Path(cached['output_path']).exists()):
+                    reused_uploads.append((safe_filename, upload_key))
+                    continue
+
+                # Detect file type by extension
+                file_ext = file_path.suffix.lower()
+
+                # Legacy extensions that are really ZIP-based OOXML only need renaming
+                if file_ext in LEGACY_FORMATS:
+                    target_ext = LEGACY_FORMATS[file_ext][0]
+                    if uploaded_file.getbuffer()[:4].tobytes() == ZIP_MAGIC:
+                        file_path = file_path.with_suffix(target_ext)
+                        file_ext = target_ext
+
+                # Stream to disk in bounded chunks instead of one giant write
+                uploaded_file.seek(0)
+                with open(file_path, 'wb') as f:
+                    shutil.copyfileobj(uploaded_file, f, length=COPY_BUFFER_SIZE)
+
+                if file_ext in LEGACY_FORMATS:
+                    # Convert legacy formats to modern ones below, in one batch per format
+                    target_ext = LEGACY_FORMATS[file_ext][0]
+                    legacy_files.setdefault(target_ext, []).append(
+                        (len(files_to_process), safe_filename, file_path)
+                    )
+                    files_to_process.append(None)
+                    upload_keys.append(upload_key)
+                    batch_keys.add(upload_key)
+                    continue
+                elif file_ext == '.docx':
+                    files_to_process.append((safe_filename, file_path, 'word', '.docx'))
+                elif file_ext == '.pptx':
+                    files_to_process.append((safe_filename, file_path, 'powerpoint', '.pptx'))
+                elif file_ext == '.xlsx':
+                    files_to_process.append((safe_filename, file_path, 'excel', '.xlsx'))
+                elif file_ext == '.xlsm':
+                    files_to_process.append((safe_filename, file_path, 'excel', '.xlsm'))
+                else:
+                    st.warning(f"Unsupported file type: {safe_filename}")
+                    continue
+                upload_keys.append(upload_key)
+                batch_keys.add(upload_key)
+
+            # One soffice run per target format amortizes LibreOffice startup
+            for target_ext, pending in legacy_files.items():
+                file_type = LEGACY_TARGET_TYPES[target_ext]
+                with st.spinner(f"Converting {len(pending)} file(s) to {target_ext[1:].upper()}..."):
                     try:
-                        cmd = [
-                            'soffice', '--headless', '--norestore', '--nologo',
-                            '--nofirststartwizard', '--convert-to', 'xlsx',
-                            '--outdir', str(input_dir), str(file_path)
-                        ]
-                        subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-                        converted_path = file_path.with_suffix('.xlsx')
-                        if converted_path.exists():
-                            files_to_process.append((safe_filename, converted_path, 'excel', '.xlsx'))
-                        else:
-                            st.error(f"Conversion failed: {safe_filename}")
+                        outputs, _ = convert_batch(
+                            [file_path for _, _, file_path in pending], target_ext[1:], input_dir,
+                            timeout=LEGACY_TIMEOUT_PER_FILE * len(pending),
+                            # Sessions convert concurrently on their own script
+                            # threads: each needs its own profile
+                            profile_dir=thread_profile_dir(),
+                            keep_server=False  # Script threads are short-lived
+                        )
                     except Exception as e:
                         st.error(f"Conversion error: {e}")
+                        continue
 
-            elif file_ext == '.docx':
-                files_to_process.append((safe_filename, file_path, 'word', '.docx'))
-            elif file_ext == '.pptx':
-                files_to_process.append((safe_filename, file_path, 'powerpoint', '.pptx'))
-            elif file_ext == '.xlsx':
-                files_to_process.append((safe_filename, file_path, 'excel', '.xlsx'))
-            elif file_ext == '.xlsm':
-                files_to_process.append((safe_filename, file_path, 'excel', '.xlsm'))
-            else:
-                st.warning(f"Unsupported file type: {safe_filename}")
+                for position, safe_filename, file_path in pending:
+                    converted_path = outputs[file_path]
+                    if converted_path is not None:
+                        files_to_process[position] = (safe_filename, converted_path, file_type, target_ext)
+                    else:
+                        st.error(f"Conversion failed: {safe_filename}")
 
-        # Check if any files were successfully prepared
-        if not files_to_process:
-            st.error("❌ No files could be processed. Check file formats and conversion errors above.")
-            st.stop()
+            upload_keys = [key for key, entry in zip(upload_keys, files_to_process) if entry is not None]
+            files_to_process = [entry for entry in files_to_process if entry is not None]
 
-        # Load mappings and precompile patterns
-        with st.spinner("Loading anonymization mappings..."):
-            try:
-                alias_map = load_aliases_from_excel(excel_path)
-                sorted_keys = categorize_and_sort_aliases(alias_map)
-                compiled_patterns = precompile_patterns(alias_map)  # Precompile for performance
-                st.success(f"✓ {len(alias_map)} mappings loaded")
-            except Exception as e:
-                st.error(f"Mapping error: {e}")
+            # Check if any files were successfully prepared
+            if not files_to_process and not reused_uploads:
+                st.error("❌ No files could be processed. Check file formats and conversion errors above.")
                 st.stop()
 
-        st.divider()
-
-        # Create a container for the entire processing section that we can clear later
-        processing_container = st.container()
-
-        with processing_container:
-            st.markdown('<div class="section-container">', unsafe_allow_html=True)
-            st.markdown('<h2 style="margin: 0 0 1rem 0; font-size: 1.4rem; font-weight: 500; letter-spacing: 0.05em;">PROCESSING FILES...</h2>', unsafe_allow_html=True)
-
-            # Simple progress indicators using empty containers for in-place updates
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-
-            # Create empty containers for metrics
-            metrics_cols = st.columns(5)
-            metric_containers = []
-            for col in metrics_cols:
-                with col:
-                    metric_containers.append(st.empty())
-
-            # Initialize display
-            metric_containers[0].metric("FILES", f"0/{len(files_to_process)}")
-            metric_containers[1].metric("REPLACEMENTS", "0")
-            metric_containers[2].metric("IMAGES REMOVED", "0")
-            metric_containers[3].metric("HYPERLINKS", "0" if remove_hyperlinks else "—")
-            metric_containers[4].metric("PDF STATUS", "⏳")
-
-            st.markdown('</div>', unsafe_allow_html=True)
-
-        # Initialize counters and logs
-        total_replacements = 0
-        total_images = 0
-        total_hyperlinks = 0
-        results = []
-        replacement_details = []  # NEW: Track what was actually replaced
-        st.session_state.processing_logs = []
-
-        logger = logging.getLogger(__name__)
-
-        # Process files with compact updates
-        for i, (original_name, input_path, file_type, output_ext) in enumerate(files_to_process):
-            # Update status line
-            status_text.text(f"Processing: {original_name}")
-
-            # Output path preserves original format
-            output_filename = Path(original_name).stem + output_ext
-            original_output_path = originals_output_dir / output_filename
-
-            log_entry = {
-                'filename': original_name,
-                'file_type': file_type,
-                'status': 'processing',
-                'details': []
+            # Load mappings and precompile patterns
+            with st.spinner("Loading anonymization mappings..."):
+                try:
+                    alias_map, sorted_keys = load_alias_mappings(excel_file.getvalue())
+                    compiled_patterns = precompile_patterns(alias_map)  # Precompile for performance
+                    st.success(f"✓ {len(alias_map)} mappings loaded")
+                except Exception as e:
+                    st.error(f"Mapping error: {e}")
+                    st.stop()
+
+            st.divider()
+
+            # Create a container for the entire processing section that we can clear later
+            processing_container = st.container()
+
+            with processing_container:
+                st.markdown('<div class="section-container">', unsafe_allow_html=True)
+                st.markdown('<h2 style="margin: 0 0 1rem 0; font-size: 1.4rem; font-weight: 500; letter-spacing: 0.05em;">PROCESSING FILES...</h2>', unsafe_allow_html=True)
+
+                # Simple progress indicators using empty containers for in-place updates
+                progress_bar = st.progress(0)
+                status_text = st.empty()
+
+                # Create empty containers for metrics
+                metrics_cols = st.columns(5)
+                metric_containers = []
+                for col in metrics_cols:
+                    with col:
+                        metric_containers.append(st.empty())
+
+                # Initialize display
+                metric_containers[0].metric("FILES", f"0/{len(files_to_process)}")
+                metric_containers[1].metric("REPLACEMENTS", "0")
+                metric_containers[2].metric("IMAGES REMOVED", "0")
+                metric_containers[3].metric("HYPERLINKS", "0" if remove_hyperlinks else "—")
+                metric_containers[4].metric("PDF STATUS", "⏳")
+
+                st.markdown('</div>', unsafe_allow_html=True)
+
+            # Initialize counters and logs
+            total_replacements = 0
+            total_images = 0
+            total_hyperlinks = 0
+            results = [None] * len(files_to_process)
+            replacement_details = []  # NEW: Track what was actually replaced
+            file_replacement_details = [[] for _ in files_to_process]
+            processing_logs = [None] * len(files_to_process)
+
+            # Output paths preserve the original format; PDFs share the stem.
+            # Computed once here instead of in every worker/stage.
+            output_paths = []
+            for original_name, _, _, output_ext in files_to_process:
+                stem = Path(original_name).stem
+                output_paths.append((originals_output_dir / (stem + output_ext),
+                                     pdf_output_dir / (stem + '.pdf')))
+
+            worker_args = [
+                (i, original_name, input_path, file_type, output_paths[i][0],
+                 alias_map, sorted_keys, compiled_patterns, options)
+                for i, (original_name, input_path, file_type, _) in enumerate(files_to_process)
+            ]
+
+            # PERFORMANCE: Pipeline anonymization and PDF conversion. Anonymized
+            # files are handed to a separate PDF pool in chunks as soon as they're
+            # written, so LibreOffice runs overlap with the remaining anonymization.
+            max_workers = max(1, min(ANON_WORKERS, len(files_to_process)))
+            pdf_workers = max(1, min(PDF_WORKERS, len(files_to_process)))
+            chunk_size = max(1, min(PDF_BATCH_SIZE, -(-len(files_to_process) // pdf_workers)))
+            status_text.text(f"Processing {len(files_to_process)} files with {max_workers} workers...")
+
+            completed = 0
+            converted = 0
+            pdf_success = 0
+            pdf_chunk = []
+            anonymized = set()
+            anon_pool = get_worker_pool()
+            pdf_pool = get_pdf_pool()
+            anon_broken = False
+            pdf_broken = False
+
+            def apply_pdf_statuses(statuses):
+                """Record a converted chunk's PDF results; returns the success count."""
+                successes = 0
+                for index, pdf_status, size_kb, detail, log_status in statuses:
+                    results[index]['pdf_status'] = pdf_status
+                    results[index]['pdf_size_kb'] = size_kb
+                    processing_logs[index]['details'].append(detail)
+                    processing_logs[index]['status'] = log_status
+                    if log_status == 'success':
+                        successes += 1
+                return successes
+
+            anon_futures = {
+                anon_pool.submit(process_uploaded_file_worker, args): args
+                for args in worker_args
             }
-
-            try:
-                # Route to appropriate processor based on file type (with detailed tracking)
-                if file_type == 'word':
-                    replacements, images, hyperlinks, details = process_single_docx(
-                        input_path, original_output_path, alias_map, sorted_keys, logger,
-                        remove_images=remove_images,
-                        remove_hyperlinks=remove_hyperlinks,
-                        clear_headers_footers_flag=clear_headers_footers,
-                        track_details=True  # NEW: Enable detailed replacement tracking
-                    )
-                    log_parts = [f"Word: {replacements} replacements", f"{images} images removed"]
-                    if remove_hyperlinks:
-                        log_parts.append(f"{hyperlinks} hyperlinks removed")
-                    log_entry['details'].append(", ".join(log_parts))
-
-                    # Store replacement details for this file
-                    if details:
-                        for original, count in details.items():
-                            replacement_details.append({
-                                'File': original_name,
-                                'Original': original,
-                                'Replacement': alias_map.get(original, alias_map.get(original.lower(), '?')),
-                                'Count': count
-                            })
-
-                elif file_type == 'powerpoint':
-                    replacements, images, hyperlinks, details = process_single_pptx(
-                        input_path, original_output_path, alias_map, sorted_keys,
-                        compiled_patterns, logger, remove_images=remove_images,
-                        remove_hyperlinks=remove_hyperlinks,
-                        track_details=True  # NEW: Enable detailed replacement tracking
-                    )
-                    log_parts = [f"PowerPoint: {replacements} replacements", f"{images} images removed"]
-                    if remove_hyperlinks:
-                        log_parts.append(f"{hyperlinks} hyperlinks removed")
-                    log_entry['details'].append(", ".join(log_parts))
-
-                    # Store replacement details for this file
-                    if details:
-                        for original, count in details.items():
-                            replacement_details.append({
-                                'File': original_name,
-                                'Original': original,
-                                'Replacement': alias_map.get(original, alias_map.get(original.lower(), '?')),
-                                'Count': count
-                            })
-
-                elif file_type == 'excel':
-                    replacements, images, hyperlinks, details = process_single_xlsx(
-                        input_path, original_output_path, alias_map, sorted_keys,
-                        compiled_patterns, logger, remove_images=False,
-                        remove_hyperlinks=remove_hyperlinks,
-                        track_details=True  # NEW: Enable detailed replacement tracking
+            pdf_futures = {}
+
+            while anon_futures or pdf_futures:
+                done, _ = wait(list(anon_futures) + list(pdf_futures), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    if future in pdf_futures:
+                        chunk = pdf_futures.pop(future)
+                        try:
+                            statuses = future.result()
+                        except Exception as e:
+                            pdf_broken = pdf_broken or isinstance(e, BrokenProcessPool)
+                            statuses = [(index, '✗ Error', 0, f"PDF: Error - {str(e)[:100]}", 'warning')
+                                        for index, _, _ in chunk]
+                        pdf_success += apply_pdf_statuses(statuses)
+                        converted += len(chunk)
+                        metric_containers[4].metric("PDF SUCCESS", f"{pdf_success}/{converted}")
+                        continue
+
+                    index, original_name, _, file_type = anon_futures.pop(future)[:4]
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        # Worker crashed or arguments failed to pickle
+                        anon_broken = anon_broken or isinstance(e, BrokenProcessPool)
+                        outcome = {
+                            'index': index,
+                            'result': {
+                                'filename': original_name,
+                                'file_type': file_type.capitalize(),
+                                'replacements': 0,
+                                'images': 0,
+                                'hyperlinks': 0,
+                                'pdf_status': f'✗ {file_type.capitalize()} Error',
+                                'pdf_size_kb': 0
+                            },
+                            'log_entry': {
+                                'filename': original_name,
+                                'file_type': file_type,
+                                'status': 'error',
+                                'details': [f"Processing Error: {str(e)[:100]}"]
+                            },
+                            'replacement_details': [],
+                            'replacements': 0,
+                            'images': 0,
+                            'hyperlinks': 0
+                        }
+
+                    results[index] = outcome['result']
+                    processing_logs[index] = outcome['log_entry']
+                    replacement_details.extend(outcome['replacement_details'])
+                    file_replacement_details[index] = outcome['replacement_details']
+                    total_replacements += outcome['replacements']
+                    total_images += outcome['images']
+                    total_hyperlinks += outcome['hyperlinks']
+                    if 'output_path' in outcome:
+                        anonymized.add(index)
+                        pdf_chunk.append((index, *output_paths[index]))
+                    completed += 1
+
+                    # Convert to PDF (works for all file types via LibreOffice). Chunks
+                    # keep the per-file timeout meaningful; flush the last partial one.
+                    if pdf_chunk and (len(pdf_chunk) >= chunk_size or not anon_futures):
+                        try:
+                            pdf_futures[pdf_pool.submit(convert_pdf_chunk_worker, (pdf_chunk, pdf_output_dir))] = pdf_chunk
+                        except BrokenProcessPool as e:
+                            pdf_broken = True
+                            pdf_success += apply_pdf_statuses(
+                                [(index, '✗ Error', 0, f"PDF: Error - {str(e)[:100]}", 'warning')
+                                 for index, _, _ in pdf_chunk]
+                            )
+                            converted += len(pdf_chunk)
+                        pdf_chunk = []
+
+                    # Update progress and metrics IN PLACE
+                    status_text.text(f"Anonymized: {original_name}")
+                    metric_containers[0].metric("FILES", f"{completed}/{len(files_to_process)}")
+                    metric_containers[1].metric("REPLACEMENTS", f"{total_replacements:,}")
+                    metric_containers[2].metric("IMAGES REMOVED", f"{total_images:,}")
+                    metric_containers[3].metric("HYPERLINKS", f"{total_hyperlinks:,}" if remove_hyperlinks else "—")
+
+                progress_bar.progress((completed + converted) / (2 * len(files_to_process)))
+
+            progress_bar.progress(1.0)
+
+            # A dead worker breaks the whole pool; start fresh next batch
+            if anon_broken:
+                get_worker_pool.clear()
+            if pdf_broken:
+                get_pdf_pool.clear()
+
+            # Remember anonymized outputs (with their PDF only if it converted),
+            # then serve duplicate uploads from them
+            for index, upload_key in enumerate(upload_keys):
+                if index in anonymized:
+                    output_path, pdf_path = output_paths[index]
+                    if processing_logs[index]['status'] != 'success':
+                        pdf_path = None
+                    st.session_state.processed_cache[upload_key] = store_processed_outputs(
+                        upload_key, output_path, pdf_path, results[index], processing_logs[index], file_replacement_details[index]
                     )
-                    log_parts = [f"Excel: {replacements} replacements"]
-                    if remove_hyperlinks:
-                        log_parts.append(f"{hyperlinks} hyperlinks removed")
-                    log_entry['details'].append(", ".join(log_parts))
-
-                    # Store replacement details for this file
-                    if details:
-                        for original, count in details.items():
-                            replacement_details.append({
-                                'File': original_name,
-                                'Original': original,
-                                'Replacement': alias_map.get(original, alias_map.get(original.lower(), '?')),
-                                'Count': count
-                            })
-
-                else:
-                    raise ValueError(f"Unsupported file type: {file_type}")
-
-                # CRITICAL: Verify output file was actually created (prevents silent failures)
-                if not Path(original_output_path).exists():
-                    raise FileNotFoundError(f"Output file not created - processing failed silently")
-
-                # Check for 0-byte files (indicates incomplete processing)
-                if Path(original_output_path).stat().st_size == 0:
-                    raise ValueError(f"Output file is empty (0 bytes) - processing incomplete")
 
-                total_replacements += replacements
-                total_images += images
-                total_hyperlinks += hyperlinks
-
-                # Convert to PDF (works for all file types via LibreOffice)
-                pdf_output_path = pdf_output_dir / Path(original_name).with_suffix('.pdf').name
-
-                try:
-                    cmd = [
-                        'soffice', '--headless', '--norestore', '--nologo',
-                        '--nofirststartwizard', '--convert-to', 'pdf',
-                        '--outdir', str(pdf_output_dir), str(original_output_path)
-                    ]
-                    subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-
-                    expected_output = pdf_output_dir / f"{original_output_path.stem}.pdf"
-
-                    if expected_output.exists():
-                        if expected_output != pdf_output_path:
-                            shutil.move(str(expected_output), str(pdf_output_path))
-
-                        size_kb = pdf_output_path.stat().st_size / 1024
-                        log_entry['details'].append(f"PDF: Success ({size_kb:.0f} KB)")
-                        log_entry['status'] = 'success'
-
-                        results.append({
-                            'filename': original_name,
-                            'file_type': file_type.capitalize(),
-                            'replacements': replacements,
-                            'images': images,
-                            'hyperlinks': hyperlinks,
-                            'pdf_status': '✓ Success',
-                            'pdf_size_kb': round(size_kb)
-                        })
-                    else:
-                        log_entry['details'].append("PDF: Conversion failed")
-                        log_entry['status'] = 'warning'
-                        results.append({
-                            'filename': original_name,
-                            'file_type': file_type.capitalize(),
-                            'replacements': replacements,
-                            'images': images,
-                            'hyperlinks': hyperlinks,
-                            'pdf_status': '✗ Failed',
-                            'pdf_size_kb': 0
-                        })
-
-                except subprocess.TimeoutExpired:
-                    log_entry['details'].append("PDF: Timeout (5min exceeded)")
-                    log_entry['status'] = 'warning'
+            for safe_filename, upload_key in reused_uploads:
+                cached = st.session_state.processed_cache.pop(upload_key, None)
+                if cached is None:
+                    # The identical upload earlier in this batch failed
                     results.append({
-                        'filename': original_name,
-                        'file_type': file_type.capitalize(),
-                        'replacements': replacements,
-                        'images': images,
-                        'hyperlinks': hyperlinks,
-                        'pdf_status': '⚠ Timeout',
+                        'filename': safe_filename,
+                        'file_type': '—',
+                        'replacements': 0,
+                        'images': 0,
+                        'hyperlinks': 0,
+                        'pdf_status': '✗ Failed',
                         'pdf_size_kb': 0
                     })
-                except Exception as e:
-                    log_entry['details'].append(f"PDF: Error - {str(e)[:100]}")
-                    log_entry['status'] = 'warning'
-                    results.append({
-                        'filename': original_name,
-                        'file_type': file_type.capitalize(),
-                        'replacements': replacements,
-                        'images': images,
-                        'hyperlinks': hyperlinks,
-                        'pdf_status': '✗ Error',
-                        'pdf_size_kb': 0
+                    processing_logs.append({
+                        'filename': safe_filename,
+                        'file_type': '—',
+                        'status': 'error',
+                        'details': ["Identical to another upload in this batch that failed"]
                     })
+                    continue
 
-            except Exception as e:
-                log_entry['details'].append(f"Processing Error: {str(e)[:100]}")
-                log_entry['status'] = 'error'
-                results.append({
-                    'filename': original_name,
-                    'file_type': file_type.capitalize(),
-                    'replacements': 0,
-                    'images': 0,
-                    'hyperlinks': 0,
-                    'pdf_status': f'✗ {file_type.capitalize()} Error',
-                    'pdf_size_kb': 0
-                })
-
-            # Store log entry
-            st.session_state.processing_logs.append(log_entry)
-
-            # Update progress and metrics IN PLACE
-            progress_bar.progress((i + 1) / len(files_to_process))
-
-            # Update metric containers instead of creating new metrics
-            metric_containers[0].metric("FILES", f"{i+1}/{len(files_to_process)}")
-            metric_containers[1].metric("REPLACEMENTS", f"{total_replacements:,}")
-            metric_containers[2].metric("IMAGES REMOVED", f"{total_images:,}")
-            metric_containers[3].metric("HYPERLINKS", f"{total_hyperlinks:,}" if remove_hyperlinks else "—")
-            pdf_success = sum(1 for r in results if '✓' in r.get('pdf_status', ''))
-            metric_containers[4].metric("PDF SUCCESS", f"{pdf_success}/{i+1}")
-
-        # Clear status and show completion
-        status_text.success("✓ Processing Complete!")
-
-        # Save results to session state
-        st.session_state.results = results
-        st.session_state.replacement_details = replacement_details  # NEW: Store detailed replacements
-        st.session_state.total_files = len(files_to_process)
-        st.session_state.total_replacements = total_replacements
-        st.session_state.total_images = total_images
-        st.session_state.total_hyperlinks = total_hyperlinks
-        st.session_state.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-        # Create ZIP archives
-        timestamp = st.session_state.timestamp
-
-        # ZIP 1: Original formats (preserves .docx, .pptx, .xlsx)
-        originals_zip_path = temp_path / f"anonymized_originals_{timestamp}.zip"
-        with zipfile.ZipFile(originals_zip_path, 'w') as zipf:
-            # Add all files from originals_output_dir (mixed formats)
-            for file in originals_output_dir.glob('*'):
-                if file.is_file():
-                    zipf.write(file, file.name)
-
-        with open(originals_zip_path, 'rb') as f:
-            st.session_state.originals_zip_data = f.read()
-
-        # ZIP 2: PDFs (all files converted to PDF)
-        pdf_zip_path = temp_path / f"anonymized_pdf_{timestamp}.zip"
-        with zipfile.ZipFile(pdf_zip_path, 'w') as zipf:
-            for pdf_file in pdf_output_dir.glob('*.pdf'):
-                zipf.write(pdf_file, pdf_file.name)
-
-        with open(pdf_zip_path, 'rb') as f:
-            st.session_state.pdf_zip_data = f.read()
-
-        st.session_state.processing_complete = True
-        st.rerun()  # Reload page to show only results, hiding processing section
+                # Re-inserted so the cache evicts least recently used first
+                st.session_state.processed_cache[upload_key] = cached
+                result, log_entry, details = reuse_processed_outputs(
+                    cached, safe_filename, originals_output_dir, pdf_output_dir
+                )
+                results.append(result)
+                processing_logs.append(log_entry)
+                replacement_details.extend(details)
+                total_replacements += result['replacements']
+                total_images += result['images']
+                total_hyperlinks += result['hyperlinks']
+
+            prune_processed_cache()
+            st.session_state.processing_logs = processing_logs
+
+            # Clear status and show completion
+            status_text.success("✓ Processing Complete!")
+
+            # Save results to session state
+            st.session_state.results = results
+            st.session_state.replacement_details = replacement_details  # NEW: Store detailed replacements
+            st.session_state.replacement_summary = None  # Rebuilt on first render
+            st.session_state.pdf_success_count = sum(1 for r in results if '✓' in r['pdf_status'])
+            st.session_state.total_files = len(results)
+            st.session_state.total_replacements = total_replacements
+            st.session_state.total_images = total_images
+            st.session_state.total_hyperlinks = total_hyperlinks
+            st.session_state.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+            # Create ZIP archives
+            # ZIP 1: Original formats (preserves .docx, .pptx, .xlsx)
+            build_download_zip('originals', originals_output_dir)
+
+            # ZIP 2: PDFs (all files converted to PDF)
+            build_download_zip('pdf', pdf_output_dir, suffix='.pdf')
+
+            st.session_state.processing_complete = True
+
+    # Hide the processing section; results render below without a rerun
+    processing_placeholder.empty()
 
 # Results display
 if st.session_state.processing_complete:
-    st.divider()
+    with results_placeholder.container():
+        st.divider()
 
-    # Sticky results container with prominent downloads
-    st.markdown('<div class="sticky-results">', unsafe_allow_html=True)
-
-    # Success header
-    st.markdown('''
-        <div style="text-align: center; margin-bottom: 1.5rem;">
-            <h2 style="margin: 0 0 0.5rem 0; font-size: 2rem; color: #4ade80;">✓ PROCESSING COMPLETE</h2>
-            <p style="color: rgba(255,255,255,0.7); font-size: 1.1rem; margin: 0;">
-                Your files are ready for download
-            </p>
-        </div>
-    ''', unsafe_allow_html=True)
-
-    # Download buttons row - prominent and centered
-    col1, col2, col3 = st.columns([1, 3, 1])
-
-    with col2:
-        download_cols = st.columns(2)
-
-        with download_cols[0]:
-            if st.session_state.originals_zip_data:
-                st.download_button(
-                    label="📄 DOWNLOAD ORIGINAL FORMATS",
-                    data=st.session_state.originals_zip_data,
-                    file_name=f"anonymized_originals_{st.session_state.timestamp}.zip",
-                    mime="application/zip",
+        # Sticky results container with prominent downloads
+        st.markdown('<div class="sticky-results">', unsafe_allow_html=True)
+
+        # Success header
+        st.markdown('''
+            <div style="text-align: center; margin-bottom: 1.5rem;">
+                <h2 style="margin: 0 0 0.5rem 0; font-size: 2rem; color: #4ade80;">✓ PROCESSING COMPLETE</h2>
+                <p style="color: rgba(255,255,255,0.7); font-size: 1.1rem; margin: 0;">
+                    Your files are ready for download
+                </p>
+            </div>
+        ''', unsafe_allow_html=True)
+
+        # Download buttons row - prominent and centered
+        col1, col2, col3 = st.columns([1, 3, 1])
+
+        with col2:
+            download_cols = st.columns(2)
+
+            with download_cols[0]:
+                originals_zip = open_download_zip('originals')
+                if originals_zip is not None:
+                    with originals_zip as zip_data:
+                        st.download_button(
+                            label="📄 DOWNLOAD ORIGINAL FORMATS",
+                            data=zip_data,
+                            file_name=f"anonymized_originals_{st.session_state.timestamp}.zip",
+                            mime="application/zip",
+                            width='stretch',
+                            type="primary",
+                            help="Anonymized files in original formats (.docx, .xlsx, .pptx)"
+                        )
+
+            with download_cols[1]:
+                pdf_zip = open_download_zip('pdf')
+                if pdf_zip is not None:
+                    with pdf_zip as zip_data:
+                        st.download_button(
+                            label="📑 DOWNLOAD AS PDF",
+                            data=zip_data,
+                            file_name=f"anonymized_pdf_{st.session_state.timestamp}.zip",
+                            mime="application/zip",
+                            width='stretch',
+                            type="primary",
+                            help="Anonymized files converted to PDF"
+                        )
+
+        # Summary stats in a compact row
+        st.markdown('<div style="margin-top: 2rem; padding-top: 1.5rem; border-top: 1px solid rgba(255,255,255,0.1);">', unsafe_allow_html=True)
+
+        stats_cols = st.columns(6)
+
+        with stats_cols[0]:
+            st.metric("FILES", st.session_state.total_files, delta=None)
+
+        with stats_cols[1]:
+            st.metric("REPLACEMENTS", f"{st.session_state.total_replacements:,}", delta=None)
+
+        with stats_cols[2]:
+            st.metric("IMAGES", st.session_state.total_images, delta="Removed" if st.session_state.total_images > 0 else None)
+
+        with stats_cols[3]:
+            st.metric("HYPERLINKS", st.session_state.get('total_hyperlinks', 0), delta="Removed" if st.session_state.get('total_hyperlinks', 0) > 0 else None)
+
+        with stats_cols[4]:
+            st.metric("PDF SUCCESS", f"{st.session_state.pdf_success_count}/{st.session_state.total_files}", delta=None)
+
+        with stats_cols[5]:
+            if st.button("🔄 NEW BATCH", width='stretch'):
+                # Clear processing results
+                st.session_state.processing_complete = False
+                st.session_state.results = []
+                remove_session_dir()
+                st.session_state.processing_logs = []
+
+                # Clear file uploads by incrementing the upload key
+                st.session_state.upload_key += 1
+
+                # Clear uploaded file tracking
+                if 'docx_files_uploaded' in st.session_state:
+                    del st.session_state.docx_files_uploaded
+                if 'excel_loaded' in st.session_state:
+                    del st.session_state.excel_loaded
+
+                st.rerun()
+
+        st.markdown('</div>', unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # Detailed results section below (optional viewing)
+        st.markdown('<div class="section-container" style="margin-top: 2rem;">', unsafe_allow_html=True)
+
+        # Tabs for different views
+        tab1, tab2, tab3, tab4 = st.tabs(["📊 Results Table", "🔍 Replacement Details", "📝 Processing Logs", "ℹ️ File Details"])
+
+        with tab1:
+            if st.session_state.results:
+                st.dataframe(
+                    st.session_state.results,
                     width='stretch',
-                    type="primary",
-                    help="Anonymized files in original formats (.docx, .xlsx, .pptx)"
+                    hide_index=True,
+                    height=400
                 )
 
-        with download_cols[1]:
-            if st.session_state.pdf_zip_data:
-                st.download_button(
-                    label="📑 DOWNLOAD AS PDF",
-                    data=st.session_state.pdf_zip_data,
-                    file_name=f"anonymized_pdf_{st.session_state.timestamp}.zip",
-                    mime="application/zip",
+        with tab2:
+            # NEW: Detailed replacement tracking
+            if st.session_state.get('replacement_details'):
+                st.markdown("### What Was Replaced")
+                st.caption(f"Showing {len(st.session_state.replacement_details)} unique replacements across all files")
+
+                # Sorted by File, then Count (descending); cached across rerenders
+                df_replacements = build_replacement_frame(
+                    tuple(tuple(detail.values()) for detail in st.session_state.replacement_details)
+                )
+
+                # Display with nice formatting
+                st.dataframe(
+                    df_replacements,
                     width='stretch',
-                    type="primary",
-                    help="Anonymized files converted to PDF"
+                    hide_index=True,
+                    height=500,
+                    column_config={
+                        'File': st.column_config.TextColumn('File', width='medium'),
+                        'Original': st.column_config.TextColumn('Original Text', width='medium'),
+                        'Replacement': st.column_config.TextColumn('Anonymized To', width='medium'),
+                        'Count': st.column_config.NumberColumn('Times Found', format='%d')
+                    }
                 )
 
-    # Summary stats in a compact row
-    st.markdown('<div style="margin-top: 2rem; padding-top: 1.5rem; border-top: 1px solid rgba(255,255,255,0.1);">', unsafe_allow_html=True)
-
-    stats_cols = st.columns(6)
-
-    with stats_cols[0]:
-        st.metric("FILES", st.session_state.total_files, delta=None)
-
-    with stats_cols[1]:
-        st.metric("REPLACEMENTS", f"{st.session_state.total_replacements:,}", delta=None)
-
-    with stats_cols[2]:
-        st.metric("IMAGES", st.session_state.total_images, delta="Removed" if st.session_state.total_images > 0 else None)
-
-    with stats_cols[3]:
-        st.metric("HYPERLINKS", st.session_state.get('total_hyperlinks', 0), delta="Removed" if st.session_state.get('total_hyperlinks', 0) > 0 else None)
-
-    with stats_cols[4]:
-        pdf_success = sum(1 for r in st.session_state.results if '✓' in r.get('pdf_status', ''))
-        st.metric("PDF SUCCESS", f"{pdf_success}/{st.session_state.total_files}", delta=None)
-
-    with stats_cols[5]:
-        if st.button("🔄 NEW BATCH", width='stretch'):
-            # Clear processing results
-            st.session_state.processing_complete = False
-            st.session_state.results = []
-            st.session_state.originals_zip_data = None
-            st.session_state.pdf_zip_data = None
-            st.session_state.processing_logs = []
-
-            # Clear file uploads by incrementing the upload key
-            st.session_state.upload_key += 1
-
-            # Clear uploaded file tracking
-            if 'docx_files_uploaded' in st.session_state:
-                del st.session_state.docx_files_uploaded
-            if 'excel_loaded' in st.session_state:
-                del st.session_state.excel_loaded
-
-            st.rerun()
-
-    st.markdown('</div>', unsafe_allow_html=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    # Detailed results section below (optional viewing)
-    st.markdown('<div class="section-container" style="margin-top: 2rem;">', unsafe_allow_html=True)
-
-    # Tabs for different views
-    tab1, tab2, tab3, tab4 = st.tabs(["📊 Results Table", "🔍 Replacement Details", "📝 Processing Logs", "ℹ️ File Details"])
-
-    with tab1:
-        if st.session_state.results:
-            st.dataframe(
-                st.session_state.results,
-                width='stretch',
-                hide_index=True,
-                height=400
-            )
-
-    with tab2:
-        # NEW: Detailed replacement tracking
-        if st.session_state.get('replacement_details'):
-            st.markdown("### What Was Replaced")
-            st.caption(f"Showing {len(st.session_state.replacement_details)} unique replacements across all files")
-
-            # Group by file for cleaner display
-            import pandas as pd
-            df_replacements = pd.DataFrame(st.session_state.replacement_details)
-
-            # Sort by File, then Count (descending)
-            df_replacements = df_replacements.sort_values(['File', 'Count'], ascending=[True, False])
-
-            # Display with nice formatting
-            st.dataframe(
-                df_replacements,
-                width='stretch',
-                hide_index=True,
-                height=500,
-                column_config={
-                    'File': st.column_config.TextColumn('File', width='medium'),
-                    'Original': st.column_config.TextColumn('Original Text', width='medium'),
-                    'Replacement': st.column_config.TextColumn('Anonymized To', width='medium'),
-                    'Count': st.column_config.NumberColumn('Times Found', format='%d')
-                }
-            )
-
-            # Summary stats by file
-            st.markdown("---")
-            st.markdown("### Summary by File")
-            summary = df_replacements.groupby('File').agg({
-                'Count': 'sum',
-                'Original': 'count'
-            }).rename(columns={'Count': 'Total Replacements', 'Original': 'Unique Terms'})
-            st.dataframe(summary, width='stretch')
-
-        else:
-            st.info("No replacements were made in this batch.")
-
-    with tab3:
-        if st.session_state.get('processing_logs'):
-            for log in st.session_state.processing_logs:
-                status_icon = "✓" if log['status'] == 'success' else "⚠" if log['status'] == 'warning' else "❌"
-                with st.expander(f"{status_icon} {log['filename']}", expanded=False):
-                    for detail in log['details']:
-                        st.text(detail)
-
-    with tab4:
-        # Show individual file sizes and details
-        for result in st.session_state.results:
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.text(f"📄 {result['filename']}")
-            with col2:
-                if result.get('pdf_size_kb', 0) > 0:
-                    st.text(f"{result['pdf_size_kb']} KB")
-
-    st.markdown('</div>', unsafe_allow_html=True)
+                # Summary stats by file
+                st.markdown("---")
+                st.markdown("### Summary by File")
+                if st.session_state.replacement_summary is None:
+                    st.session_state.replacement_summary = df_replacements.groupby('File', observed=True).agg({
+                        'Count': 'sum',
+                        'Original': 'count'
+                    }).rename(columns={'Count': 'Total Replacements', 'Original': 'Unique Terms'})
+                st.dataframe(st.session_state.replacement_summary, width='stretch')
+
+            else:
+                st.info("No replacements were made in this batch.")
+
+        with tab3:
+            if st.session_state.get('processing_logs'):
+                for log in st.session_state.processing_logs:
+                    status_icon = "✓" if log['status'] == 'success' else "⚠" if log['status'] == 'warning' else "❌"
+                    with st.expander(f"{status_icon} {log['filename']}", expanded=False):
+                        for detail in log['details']:
+                            st.text(detail)
+
+        with tab4:
+            # Show individual file sizes and details
+            for result in st.session_state.results:
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.text(f"📄 {result['filename']}")
+                with col2:
+                    if result.get('pdf_size_kb', 0) > 0:
+                        st.text(f"{result['pdf_size_kb']} KB")
+
+        st.markdown('</div>', unsafe_allow_html=True)
@@ -4,6 +4,70 @@ Shared Anonymization Utilities
 Used by Word, PowerPoint, and Excel processors to avoid code duplication
 """
 
+# Optional: Aho-Corasick automaton (pyahocorasick) to rule out alias-free
+# text in one linear C-level scan before running the combined regex
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# re.IGNORECASE also matches 'i' against U+0130 and U+0131, which
+# str.casefold keeps distinct; map them first so folding never hides a match
+_FOLD_FIXES = str.maketrans({'\u0130': 'i', '\u0131': 'i'})
+
+
+def fold_case(text):
+    """Case-fold text so every case-insensitive regex match is a substring match"""
+    if not text.isascii():
+        text = text.translate(_FOLD_FIXES)
+    return text.casefold()
+
+
+def build_alias_prefilter(keys):
+    """
+    Build an Aho-Corasick automaton over the case-folded alias keys.
+
+    Args:
+        keys: Alias originals
+
+    Returns:
+        ahocorasick.Automaton, or None when pyahocorasick isn't installed
+        or there are no keys
+    """
+    if not AHOCORASICK_AVAILABLE or not keys:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for key in keys:
+        folded = fold_case(key)
+        automaton.add_word(folded, folded)
+    automaton.make_automaton()
+    return automaton
+
+
+def may_contain_alias(prefilter, text):
+    """
+    Cheap necessary condition for the combined pattern to match text: some
+    alias occurs case-insensitively (boundaries aren't checked). Always True
+    without a prefilter.
+    """
+    if prefilter is None:
+        return True
+    return next(prefilter.iter(fold_case(text)), None) is not None
+
+
+def alias_free_result(text, compiled_patterns, track_details=False):
+    """
+    anonymize_text's result for text the compiled 'prefilter' rules out
+    (nothing to replace), or None when the combined regex has to run.
+    """
+    if may_contain_alias(compiled_patterns.get('prefilter'), text):
+        return None
+    if track_details:
+        return text, 0, {}
+    return text, 0
+
 
 def anonymize_text(text, alias_map, sorted_keys, compiled_patterns=None, track_details=False):
     """
@@ -49,6 +113,11 @@ def anonymize_text(text, alias_map, sorted_keys, compiled_patterns=None, track_d
             return result[0], result[1], {}
         return result
 
+    # Most runs/cells hold no alias at all: skip the regex pass for them
+    skipped = alias_free_result(text, compiled_patterns, track_details)
+    if skipped is not None:
+        return skipped
+
     # Track which originals were replaced (v2.1 feature)
     details = {} if track_details else None
 
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Archive Utilities
+Build download ZIPs from output directories
+"""
+
+import os
+import shutil
+import time
+import zipfile
+
+# Copy buffer for streaming files into archives (1 MiB)
+COPY_BUFFER_SIZE = 1 << 20
+
+
+def link_or_copy(src, dst):
+    """
+    Hard-link src to dst, falling back to a copy when linking isn't possible
+    (different filesystem, dst already exists, no link support).
+
+    Args:
+        src: Existing file
+        dst: New path for the same content
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def directory_size(directory, suffix=None):
+    """
+    Total size in bytes of the files in a directory (non-recursive).
+
+    Args:
+        directory: Directory to measure
+        suffix: Optional lowercase extension filter (e.g. '.pdf')
+    """
+    total = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and (not suffix or entry.name.lower().endswith(suffix)):
+                total += entry.stat().st_size
+    return total
+
+
+def zip_directory(zip_target, directory, suffix=None):
+    """
+    Add every file in a directory (non-recursive) to a new ZIP archive.
+
+    Uses os.scandir so each entry is stat'ed once, and streams each file
+    into the archive with a 1 MiB buffer instead of going through
+    ZipFile.write's re-stat + re-open. Entries are STORED (DOCX/XLSX/PPTX
+    and PDF are already compressed); the CRC32 is computed by zlib while
+    streaming, so each file is read exactly once.
+
+    Args:
+        zip_target: Path or writable file object for the archive
+        directory: Directory whose files are archived under their bare names
+        suffix: Optional lowercase extension filter (e.g. '.pdf')
+
+    Returns:
+        Number of files added
+    """
+    added = 0
+    with zipfile.ZipFile(zip_target, 'w', zipfile.ZIP_STORED, strict_timestamps=False) as zipf:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if suffix and not entry.name.lower().endswith(suffix):
+                    continue
+
+                # Build the ZipInfo from the DirEntry's cached stat
+                # (ZipInfo.from_file would stat the file again). Like
+                # strict_timestamps=False, clamp mtimes ZIP can't represent.
+                stat = entry.stat()
+                date_time = time.localtime(stat.st_mtime)[:6]
+                if date_time[0] < 1980:
+                    date_time = (1980, 1, 1, 0, 0, 0)
+                elif date_time[0] > 2107:
+                    date_time = (2107, 12, 31, 23, 59, 59)
+                zinfo = zipfile.ZipInfo(entry.name, date_time)
+                zinfo.file_size = stat.st_size
+                zinfo.external_attr = (stat.st_mode & 0xFFFF) << 16
+                zinfo.compress_type = zipfile.ZIP_STORED
+                with open(entry.path, 'rb', buffering=COPY_BUFFER_SIZE) as src, \
+                        zipf.open(zinfo, 'w') as dst:
+                    shutil.copyfileobj(src, dst, length=COPY_BUFFER_SIZE)
+                added += 1
+    return added
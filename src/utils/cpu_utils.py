@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+CPU Utilities
+Size worker pools from the CPUs this process may actually run on
+"""
+
+import os
+
+
+def available_cpu_count():
+    """
+    Number of CPUs available to this process.
+
+    Uses the scheduler affinity mask where the platform has one (Linux), so
+    taskset/cpuset limits from containers and job schedulers are respected;
+    os.cpu_count() reports every logical CPU on the machine.
+
+    Returns:
+        int: At least 1
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        try:
+            return max(1, len(os.sched_getaffinity(0)))
+        except OSError:
+            pass
+    return os.cpu_count() or 1
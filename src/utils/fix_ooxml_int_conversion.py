@@ -128,15 +128,26 @@ def patch_python_pptx():
         return False
 
 
+# Result of the first successful apply_ooxml_patches() in this process
+_applied_patches = None
+
+
 def apply_ooxml_patches():
     """
     Apply all OOXML int() conversion patches.
 
     Call this ONCE at the start of your program, BEFORE importing Document/Presentation.
+    Safe to call again (processors, batch driver and pool workers all do):
+    later calls return the first call's result without re-patching or
+    re-logging. (The patch functions themselves also refuse to wrap twice.)
 
     Returns:
         Tuple of (docx_patched, pptx_patched) booleans
     """
+    global _applied_patches
+    if _applied_patches is not None:
+        return _applied_patches
+
     import logging
     logger = logging.getLogger(__name__)
 
@@ -155,7 +166,8 @@ def apply_ooxml_patches():
         print(msg)
         logger.info(msg)
 
-    return (docx_patched, pptx_patched)
+    _applied_patches = (docx_patched, pptx_patched)
+    return _applied_patches
 
 
 # Auto-apply if run as main (for testing)
@@ -16,8 +16,31 @@ Usage:
     hyperlinks_removed = remove_hyperlinks_docx(doc)
 """
 
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from lxml import etree
 
-def remove_hyperlinks_docx(doc):
+# WordprocessingML <w:hyperlink> elements below a node, compiled once
+_WORD_NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+_HYPERLINK_XPATH = etree.XPath('.//w:hyperlink', namespaces={'w': _WORD_NAMESPACE})
+
+
+def _unwrap_hyperlinks(root) -> None:
+    """Replace each <w:hyperlink> below root with its children (runs keep their text)"""
+    for hl_elem in _HYPERLINK_XPATH(root):
+        parent = hl_elem.getparent()
+        if parent is None:
+            continue
+
+        # Move all runs out of hyperlink element, in order, just before it
+        # (sibling splice in libxml2: no child index lookup or bookkeeping)
+        for run_elem in list(hl_elem):
+            hl_elem.addprevious(run_elem)
+
+        # Remove the now-empty hyperlink element
+        parent.remove(hl_elem)
+
+
+def remove_hyperlinks_docx(doc) -> int:
     """
     Remove all hyperlink metadata from Word document while preserving display text.
 
@@ -36,79 +59,49 @@ def remove_hyperlinks_docx(doc):
     """
     removed_count = 0
 
-    # Step 1: Remove hyperlink relationships
+    # Step 1: Remove hyperlink relationships (reltype URIs end in
+    # '/hyperlink' in both the transitional and strict namespaces)
     if hasattr(doc, 'part') and hasattr(doc.part, 'rels'):
-        rels_to_remove = []
-
-        for rel_id, rel in doc.part.rels.items():
-            if hasattr(rel, 'reltype') and 'hyperlink' in rel.reltype.lower():
-                rels_to_remove.append(rel_id)
-                removed_count += 1
+        rels = doc.part.rels
+        rels_to_remove = [rel_id for rel_id, rel in rels.items()
+                          if rel.reltype.endswith('/hyperlink')]
+        removed_count += len(rels_to_remove)
 
-        # Remove the relationships
+        # Relationships is a plain dict keyed by rId, so deleting the keys
+        # is all there is to it (hyperlinks are external: no part bookkeeping)
         for rel_id in rels_to_remove:
-            if rel_id in doc.part.rels:
-                del doc.part.rels[rel_id]
-
-    # Step 2: Remove hyperlink elements from paragraphs (preserves text)
-    def remove_hyperlink_elements(paragraphs):
-        """Helper to remove hyperlink elements from a list of paragraphs"""
-        for paragraph in paragraphs:
-            p_elem = paragraph._element
-            hyperlink_elems = p_elem.findall('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}hyperlink')
-
-            for hl_elem in hyperlink_elems:
-                parent = hl_elem.getparent()
-                if parent is not None:
-                    # Get index of hyperlink element
-                    index = list(parent).index(hl_elem)
-
-                    # Move all runs out of hyperlink element
-                    for run_elem in list(hl_elem):
-                        parent.insert(index, run_elem)
-                        index += 1
-
-                    # Remove the now-empty hyperlink element
-                    parent.remove(hl_elem)
-
-    # Process main document body
-    remove_hyperlink_elements(doc.paragraphs)
-
-    # Process tables (CRITICAL for 10-K documents)
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                remove_hyperlink_elements(cell.paragraphs)
-
-    # Process headers and footers
-    for section in doc.sections:
-        # Headers
-        remove_hyperlink_elements([section.header] if hasattr(section.header, 'paragraphs') else [])
-        if hasattr(section, 'first_page_header'):
-            remove_hyperlink_elements([section.first_page_header] if hasattr(section.first_page_header, 'paragraphs') else [])
-        if hasattr(section, 'even_page_header'):
-            remove_hyperlink_elements([section.even_page_header] if hasattr(section.even_page_header, 'paragraphs') else [])
-
-        # Footers
-        remove_hyperlink_elements([section.footer] if hasattr(section.footer, 'paragraphs') else [])
-        if hasattr(section, 'first_page_footer'):
-            remove_hyperlink_elements([section.first_page_footer] if hasattr(section.first_page_footer, 'paragraphs') else [])
-        if hasattr(section, 'even_page_footer'):
-            remove_hyperlink_elements([section.even_page_footer] if hasattr(section.even_page_footer, 'paragraphs') else [])
+            del rels[rel_id]
+
+    # Step 2: Remove hyperlink elements (preserves text) with one XPath pass
+    # per part: the body covers every paragraph, table cell (nested tables
+    # included) and text box; each header/footer part is visited once via
+    # the document's relationships, without creating definitions for
+    # sections that inherit theirs
+    _unwrap_hyperlinks(doc.element.body)
+
+    for rel in doc.part.rels.values():
+        if not rel.is_external and rel.reltype in (RT.HEADER, RT.FOOTER):
+            _unwrap_hyperlinks(rel.target_part.element)
 
     return removed_count
 
 
-def remove_hyperlinks_xlsx(wb):
+def remove_hyperlinks_xlsx(wb) -> int:
     """
     Remove all hyperlink metadata from Excel workbook while preserving cell values.
 
     This should be called AFTER anonymization.
 
     Process:
-    1. Iterates through all sheets
+    1. Iterates through all worksheets
     2. Sets cell.hyperlink = None (removes link, keeps value)
 
+    A loaded workbook keeps hyperlinks only on their cells (openpyxl fills
+    the worksheet's _hyperlinks list at save time), so the cells have to be
+    visited - but only the ones that exist: the worksheet's cell store is
+    walked directly instead of iter_rows, which materializes an empty cell
+    for every gap in the used range.
+
     Args:
         wb: openpyxl Workbook object (already anonymized)
 
@@ -117,20 +110,23 @@ def remove_hyperlinks_xlsx(wb):
     """
     removed_count = 0
 
-    for sheet_name in wb.sheetnames:
-        sheet = wb[sheet_name]
-
-        for row in sheet.iter_rows():
-            for cell in row:
-                if cell.hyperlink:
-                    # Remove hyperlink but keep the cell value
-                    cell.hyperlink = None
-                    removed_count += 1
+    for sheet in wb.worksheets:
+        cell_store = getattr(sheet, '_cells', None)
+        if cell_store is not None:
+            cells = cell_store.values()
+        else:
+            cells = (cell for row in sheet.iter_rows() for cell in row)
+
+        for cell in cells:
+            if cell.hyperlink:
+                # Remove hyperlink but keep the cell value
+                cell.hyperlink = None
+                removed_count += 1
 
     return removed_count
 
 
-def remove_hyperlinks_pptx(prs):
+def remove_hyperlinks_pptx(prs) -> int:
     """
     Remove all hyperlink metadata from PowerPoint presentation while preserving text.
 
@@ -149,12 +145,20 @@ def remove_hyperlinks_pptx(prs):
     removed_count = 0
 
     for slide in prs.slides:
+        # Every removable link (run or click action) has an external
+        # hyperlink relationship on its slide part; most slides have none,
+        # so skip their shape/run walk entirely. The rels themselves are
+        # dropped by the address setters below, which also remove the
+        # <a:hlinkClick> elements referencing them.
+        if not any(rel.reltype.endswith('/hyperlink') for rel in slide.part.rels.values()):
+            continue
+
         for shape in slide.shapes:
             # Remove hyperlinks from text runs
-            if hasattr(shape, 'text_frame'):
+            if shape.has_text_frame:
                 for paragraph in shape.text_frame.paragraphs:
                     for run in paragraph.runs:
-                        if hasattr(run, 'hyperlink') and run.hyperlink.address:
+                        if run.hyperlink.address:
                             run.hyperlink.address = None
                             removed_count += 1
 
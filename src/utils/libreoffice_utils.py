@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""
+LibreOffice Conversion Utilities
+=================================
+Shared helpers for driving headless LibreOffice (soffice) conversions.
+
+Parallel soffice instances collide on the shared user profile directory
+(~/.config/libreoffice), so every process gets its own profile via
+-env:UserInstallation.
+
+When LibreOffice's Python bridge (python3-uno) is importable, each process
+keeps one resident soffice listening on a private socket and converts
+documents over UNO, turning a ~2 s process spawn into an RPC. Without the
+bridge, or if the listener can't be reached, conversions fall back to
+spawning soffice --convert-to.
+"""
+
+import logging
+import os
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from multiprocessing.util import Finalize
+from pathlib import Path
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    UNO_AVAILABLE = True
+except ImportError:
+    UNO_AVAILABLE = False
+
+# UNO export filters by target format and source extension
+UNO_FILTERS = {
+    'pdf': {
+        '.docx': 'writer_pdf_Export', '.doc': 'writer_pdf_Export',
+        '.pptx': 'impress_pdf_Export', '.ppt': 'impress_pdf_Export',
+        '.xlsx': 'calc_pdf_Export', '.xlsm': 'calc_pdf_Export', '.xls': 'calc_pdf_Export',
+    },
+    'docx': {'.doc': 'MS Word 2007 XML'},
+    'pptx': {'.ppt': 'Impress MS PowerPoint 2007 XML'},
+    'xlsx': {'.xls': 'Calc MS Excel 2007 XML'},
+}
+
+# Seconds to wait for a freshly started listener to accept connections
+UNO_STARTUP_TIMEOUT = 30
+
+# Characters of soffice's stderr kept when reporting a failed conversion
+STDERR_TAIL_CHARS = 1000
+
+# Fallback for callers that don't pass their own logger
+_logger = logging.getLogger(__name__)
+
+# Resident server per process, and per thread when conversions run on a
+# thread pool (see get_server)
+_state = threading.local()
+
+
+def worker_profile_dir(worker_id=None):
+    """
+    Return the LibreOffice user profile directory for this worker process.
+
+    Args:
+        worker_id: Unique worker identifier (defaults to the current PID)
+
+    Returns:
+        Path to a per-worker profile directory under the system temp dir
+    """
+    if worker_id is None:
+        worker_id = os.getpid()
+    return Path(tempfile.gettempdir()) / f"lo_profile_{worker_id}"
+
+
+def init_worker_profile(worker_id=None):
+    """
+    Create this worker's profile directory up front (pool initializer).
+
+    LibreOffice populates the profile on its first run; with long-lived
+    workers every later conversion reuses it instead of paying first-start
+    setup again.
+
+    Returns:
+        Path to the profile directory
+    """
+    profile_dir = worker_profile_dir(worker_id)
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    return profile_dir
+
+
+def thread_profile_dir():
+    """
+    Create and return the profile directory for the calling thread.
+
+    The main thread uses the per-process profile; other threads (e.g. a
+    conversion thread pool) each get their own, since concurrent soffice
+    instances can't share one.
+
+    Returns:
+        Path to the profile directory
+    """
+    if threading.current_thread() is threading.main_thread():
+        return init_worker_profile()
+    return init_worker_profile(f"{os.getpid()}_{threading.get_ident()}")
+
+
+def build_soffice_command(convert_to, outdir, input_files, profile_dir=None):
+    """
+    Build a headless soffice --convert-to command line.
+
+    Args:
+        convert_to: Target format (e.g. 'pdf', 'docx')
+        outdir: Directory LibreOffice writes converted files to
+        input_files: Iterable of input file paths
+        profile_dir: Optional isolated user profile directory
+
+    Returns:
+        List of command arguments for subprocess.run
+    """
+    cmd = ['soffice', '--headless', '--norestore', '--nologo', '--nofirststartwizard',
+           '--nolockcheck', '--nocrashreport']
+    if profile_dir is not None:
+        cmd.append(f"-env:UserInstallation={Path(profile_dir).as_uri()}")
+    cmd += ['--convert-to', convert_to, '--outdir', str(outdir)]
+    cmd += [str(f) for f in input_files]
+    return cmd
+
+
+def _terminate_soffice(process):
+    """Finalizer for a resident soffice whose server object is gone."""
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def _uno_property(name, value):
+    """Build a com.sun.star.beans.PropertyValue."""
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+class LibreOfficeServer:
+    """
+    Resident headless soffice driven over a UNO socket.
+
+    One instance per process; each listens on its own free port with its
+    own profile, so pool workers convert concurrently.
+    """
+
+    def __init__(self, profile_dir):
+        self.profile_dir = Path(profile_dir)
+        self.process = None
+        self.desktop = None
+        self.timed_out = False
+        self._finalizer = None
+
+    def start(self):
+        """Launch soffice and connect to it. Raises RuntimeError on failure."""
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+
+        self.process = subprocess.Popen(
+            ['soffice', f"-env:UserInstallation={self.profile_dir.as_uri()}",
+             '--headless', '--invisible', '--norestore', '--nologo', '--nofirststartwizard',
+             '--nolockcheck', '--nocrashreport',
+             f"--accept=socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        # Terminate soffice when this object is garbage collected (e.g. its
+        # thread ended) or at exit. atexit doesn't run in pool workers (they
+        # leave via os._exit) but multiprocessing finalizers do; the
+        # finalizer holds only the process, never the server itself
+        self._finalizer = Finalize(self, _terminate_soffice, args=(self.process,),
+                                   exitpriority=10)
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            'com.sun.star.bridge.UnoUrlResolver', local_context
+        )
+        url = f"uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+
+        deadline = time.monotonic() + UNO_STARTUP_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve(url)
+                break
+            except Exception:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError(f"LibreOffice listener on port {port} unavailable")
+                time.sleep(0.25)
+
+        self.desktop = context.ServiceManager.createInstanceWithContext(
+            'com.sun.star.frame.Desktop', context
+        )
+
+    def convert(self, input_path, output_path, filter_name, timeout):
+        """
+        Convert one document. A watchdog kills the server if the call exceeds
+        the timeout; the pending UNO call then fails and the caller restarts.
+
+        Returns:
+            True if the output was written
+        """
+        watchdog = threading.Timer(timeout, self.kill)
+        watchdog.start()
+        try:
+            document = self.desktop.loadComponentFromURL(
+                uno.systemPathToFileUrl(str(Path(input_path).resolve())), '_blank', 0,
+                (_uno_property('Hidden', True),)
+            )
+            try:
+                document.storeToURL(
+                    uno.systemPathToFileUrl(str(Path(output_path).resolve())),
+                    (_uno_property('FilterName', filter_name),)
+                )
+            finally:
+                document.close(True)
+            return Path(output_path).exists()
+        except Exception:
+            return False
+        finally:
+            watchdog.cancel()
+
+    def kill(self):
+        """Kill the soffice process immediately (watchdog callback)."""
+        self.timed_out = True
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+
+    def is_alive(self):
+        """True while the soffice process is running and hasn't timed out."""
+        return not self.timed_out and self.process is not None and self.process.poll() is None
+
+    def stop(self):
+        """Shut down soffice, terminating it if it doesn't exit cleanly."""
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass
+            self.desktop = None
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+        if self._finalizer is not None:
+            self._finalizer.cancel()
+            self._finalizer = None
+
+
+def get_server(profile_dir=None):
+    """
+    Return this thread's resident LibreOffice server, starting it on first use.
+
+    Args:
+        profile_dir: User profile directory (defaults to the per-worker one)
+
+    Returns:
+        LibreOfficeServer, or None if UNO is unavailable or startup failed
+    """
+    if not UNO_AVAILABLE or getattr(_state, 'failed', False):
+        return None
+    server = getattr(_state, 'server', None)
+    if server is not None and not server.is_alive():
+        server.stop()
+        server = _state.server = None
+    if server is None:
+        server = LibreOfficeServer(profile_dir or worker_profile_dir())
+        try:
+            server.start()
+        except Exception:
+            _state.failed = True
+            return None
+        _state.server = server
+    return server
+
+
+def release_server():
+    """Stop this thread's resident LibreOffice server, if it has one."""
+    server = getattr(_state, 'server', None)
+    if server is not None:
+        _state.server = None
+        server.stop()
+
+
+def _convert_batch_uno(input_files, convert_to, outdir, timeout, profile_dir):
+    """
+    Convert files one by one over UNO, restarting the server after a crash
+    or timeout.
+
+    Returns:
+        Tuple of (outputs, timed_out) where timed_out is the set of inputs
+        whose conversion hit the timeout. Files without a UNO filter, and
+        files left unattempted because no server could be (re)started, are
+        missing from outputs
+    """
+    extension = convert_to.split(':', 1)[0]
+    filters = UNO_FILTERS.get(extension, {})
+    outputs = {}
+    timed_out = set()
+
+    for input_file in input_files:
+        filter_name = filters.get(input_file.suffix.lower())
+        if filter_name is None:
+            continue  # Left for soffice --convert-to
+        server = get_server(profile_dir)
+        if server is None:
+            break
+
+        expected_output = outdir / f"{input_file.stem}.{extension}"
+        converted = server.convert(input_file, expected_output, filter_name, timeout)
+        # A timed-out server is replaced on the next get_server call, so
+        # its flag only ever describes this file
+        if server.timed_out:
+            timed_out.add(input_file)
+        outputs[input_file] = expected_output if converted else None
+
+    return outputs, timed_out
+
+
+def convert_batch(input_files, convert_to, outdir, timeout, profile_dir=None, logger=None,
+                  keep_server=True):
+    """
+    Convert several documents, over UNO when a resident server is available,
+    otherwise with a single soffice invocation.
+
+    LibreOffice startup (~1-3 s) dominates for small documents, and
+    --convert-to accepts any number of inputs, so one process per batch
+    amortizes the bootstrap across every file in it.
+
+    Args:
+        input_files: List of document paths to convert
+        convert_to: Target format (e.g. 'pdf', 'docx')
+        outdir: Directory LibreOffice writes converted files to
+        timeout: Seconds before the soffice process is killed (applied per
+                 file when converting over UNO)
+        profile_dir: Optional isolated user profile directory
+        logger: Logger for soffice's stderr when some outputs are missing
+                (defaults to this module's logger)
+        keep_server: Leave the UNO server running for the next call. Only
+                     long-lived pool workers and threads should keep one;
+                     one-off callers (e.g. a Streamlit script thread) pass
+                     False so it is stopped when the conversion ends
+
+    Returns:
+        Tuple of (outputs, timed_out) where outputs maps each input Path to
+        its converted Path, or None if no output was produced, and timed_out
+        is the set of input Paths that failed because of the timeout
+    """
+    input_files = [Path(f) for f in input_files]
+    outdir = Path(outdir)
+
+    outputs, timed_out = {}, set()
+    if UNO_AVAILABLE:
+        try:
+            outputs, timed_out = _convert_batch_uno(
+                input_files, convert_to, outdir,
+                timeout / max(1, len(input_files)), profile_dir
+            )
+        finally:
+            if not keep_server:
+                release_server()
+        remaining = [f for f in input_files if f not in outputs]
+        if not remaining:
+            return outputs, timed_out
+        input_files = remaining
+
+    cmd = build_soffice_command(convert_to, outdir, input_files, profile_dir)
+    try:
+        # Success is judged by the files soffice writes; stdout is only
+        # progress chatter, but stderr explains failures
+        stderr = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                timeout=timeout).stderr
+    except subprocess.TimeoutExpired as e:
+        # Files converted before the kill are still usable
+        killed = True
+        stderr = e.stderr
+    else:
+        killed = False
+
+    extension = convert_to.split(':', 1)[0]
+    missing = []
+    for input_file in input_files:
+        expected_output = outdir / f"{input_file.stem}.{extension}"
+        if expected_output.exists():
+            outputs[input_file] = expected_output
+        else:
+            outputs[input_file] = None
+            missing.append(input_file.name)
+            if killed:
+                timed_out.add(input_file)
+
+    if missing:
+        tail = (stderr or b'').decode('utf-8', errors='replace').strip()[-STDERR_TAIL_CHARS:]
+        (logger or _logger).warning(
+            "soffice produced no %s for %s; stderr: %s",
+            extension, ', '.join(missing), tail or '(empty)'
+        )
+    return outputs, timed_out
+
+
+class LibreOfficeBatcher:
+    """
+    Queue conversions and run them through convert_batch in groups.
+
+    Files are grouped by (target format, output directory) and flushed with
+    one conversion per group once it holds batch_size files, or when the
+    context manager exits. Two inputs with the same stem would produce the
+    same output name, so a clashing file flushes its group first. Failures
+    never raise: the file's output is None and any exception message is
+    kept in errors.
+
+    With an executor (e.g. a small ThreadPoolExecutor) flushed groups
+    convert in the background while the caller keeps working; on_result is
+    still only ever called from the caller's thread, as enqueue_convert,
+    collect or flush notice finished groups.
+
+    Usage:
+        with LibreOfficeBatcher(on_result=callback) as batcher:
+            batcher.enqueue_convert(path, 'pdf', pdf_dir)
+    """
+
+    def __init__(self, timeout_per_file=300, batch_size=20, profile_dir=None,
+                 on_result=None, executor=None, logger=None):
+        """
+        Args:
+            timeout_per_file: Seconds budgeted per file in a group
+            batch_size: Maximum files per conversion
+            profile_dir: Optional user profile directory (default: one per
+                         converting thread, see thread_profile_dir)
+            on_result: Optional callback(input_file, output_path, timed_out)
+                       called for every file as its group finishes
+            executor: Optional concurrent.futures executor to convert on
+            logger: Optional logger for soffice's stderr on failed files
+        """
+        self.timeout_per_file = timeout_per_file
+        self.batch_size = batch_size
+        self.profile_dir = profile_dir
+        self.on_result = on_result
+        self.executor = executor
+        self.logger = logger
+        self.pending = defaultdict(list)
+        self.running = []
+        self.results = {}
+        self.errors = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        return False
+
+    def enqueue_convert(self, input_file, convert_to, outdir):
+        """
+        Queue one conversion, flushing its group when full.
+
+        Args:
+            input_file: Document to convert
+            convert_to: Target format (e.g. 'pdf', 'docx')
+            outdir: Directory the converted file is written to
+        """
+        input_file = Path(input_file)
+        key = (convert_to, Path(outdir))
+        group = self.pending[key]
+        if any(f.stem == input_file.stem for f in group):
+            self._flush_group(key)
+            group = self.pending[key]
+
+        group.append(input_file)
+        if len(group) >= self.batch_size:
+            self._flush_group(key)
+        self.collect()
+
+    def flush(self, wait=True):
+        """
+        Convert everything still queued.
+
+        Args:
+            wait: Block until every started conversion has finished
+        """
+        for key in list(self.pending):
+            self._flush_group(key)
+        self.collect(wait)
+
+    def collect(self, wait=False):
+        """
+        Report finished background groups through on_result.
+
+        Args:
+            wait: Block until all running groups finish
+        """
+        still_running = []
+        for input_files, future in self.running:
+            if wait or future.done():
+                self._finish(input_files, *future.result())
+            else:
+                still_running.append((input_files, future))
+        self.running = still_running
+
+    def _flush_group(self, key):
+        input_files = self.pending.pop(key, None)
+        if not input_files:
+            return
+
+        if self.executor is None:
+            self._finish(input_files, *self._convert_group(key, input_files))
+        else:
+            self.running.append(
+                (input_files, self.executor.submit(self._convert_group, key, input_files))
+            )
+
+    def _convert_group(self, key, input_files):
+        convert_to, outdir = key
+        try:
+            outdir.mkdir(parents=True, exist_ok=True)
+            outputs, timed_out = convert_batch(
+                input_files, convert_to, outdir,
+                timeout=self.timeout_per_file * len(input_files),
+                profile_dir=self.profile_dir or thread_profile_dir(),
+                logger=self.logger
+            )
+            return outputs, timed_out, None
+        except Exception as e:
+            # e.g. soffice not installed: fail the group, keep the batch going
+            return {f: None for f in input_files}, set(), str(e)
+
+    def _finish(self, input_files, outputs, timed_out, error):
+        self.results.update(outputs)
+        if error is not None:
+            self.errors.update((f, error) for f in input_files)
+
+        if self.on_result is not None:
+            for input_file in input_files:
+                output = outputs[input_file]
+                self.on_result(input_file, output, input_file in timed_out)